@@ -0,0 +1,58 @@
+import argparse
+
+from common import best_of, scaled_csv
+
+import main
+
+LANG = 'Language Indicator'
+
+# the aggregation behind each chart, run straight on the rows: (name, keys, release count as well as hours?)
+CHARTS = [
+    ('viewership_by_content_type', ['Content Type'], False),
+    ('viewership_by_language', [LANG], False),
+    ('monthly_viewership', ['Release Month'], False),
+    ('monthly_viewership_by_type', ['Release Month', 'Content Type'], False),
+    ('seasonal_viewership', ['Release Season'], False),
+    ('monthly_releases_and_viewership', ['Release Month'], True),
+    ('weekday_release_patterns', ['Release Day'], True),
+]
+CUBE_DIMS = ['Content Type', LANG, 'Release Month', 'Release Day', 'Release Year',
+             'Available Globally?']
+
+
+def groupby_agg(df, dims, count, dropna=True):
+    grouped = df.groupby(dims, observed=True, dropna=dropna)['Hours Viewed']
+    return grouped.agg(count='size', hours='sum') if count else grouped.sum().to_frame('hours')
+
+
+def bincount_agg(df, dims, count, dropna=True):
+    return main.bincount_sums(df, dims, {'hours': 'Hours Viewed'}, size='count' if count else None, dropna=dropna)
+
+
+def compare(name, df, dims, count, repeat, dropna=True):
+    before_t, before = best_of(lambda: groupby_agg(df, dims, count, dropna), repeat)
+    after_t, after = best_of(lambda: bincount_agg(df, dims, count, dropna), repeat)
+    # bincount puts missing keys first and groupby last, so compare the cells sorted the same way
+    before = before.reset_index().sort_values(dims, na_position='last', ignore_index=True)
+    after = after[list(before.columns)].sort_values(dims, na_position='last', ignore_index=True)
+    same = before.astype(after.dtypes).equals(after)
+    print(f"  {name:<34} groupby {before_t * 1e3:8.1f} ms | bincount {after_t * 1e3:8.1f} ms"
+          f" | {before_t / after_t:5.1f}x faster | identical: {same}")
+
+
+def run(rows, repeat):
+    path = scaled_csv(rows)
+    df = main.load_clean_data(path, 'Hours Viewed', 'Release Date', LANG, cache_dir=None)
+    print(f"{rows} rows")
+    for name, dims, count in CHARTS:
+        compare(name, df, dims, count, repeat)
+    compare('cube (all keys, NA kept)', df, CUBE_DIMS, True, repeat, dropna=False)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark the bincount aggregation against pandas groupby per chart')
+    parser.add_argument('--rows', type=int, nargs='+', default=[1_000_000, 10_000_000])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+    for rows in args.rows:
+        run(rows, args.repeat)
@@ -0,0 +1,38 @@
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from common import SAMPLE_CSV, best_of
+
+import main
+
+
+def legacy_clean_hours(df, col='Hours Viewed'):
+    # clean_hours before parse_grouped_ints: several full string copies of the column
+    df[col] = df[col].astype(str).str.replace(',', '').str.strip()
+    df[col] = pd.to_numeric(df[col], errors='coerce')
+    return df
+
+
+def hours_column(rows):
+    sample = pd.read_csv(SAMPLE_CSV, usecols=['Hours Viewed'], dtype=str)['Hours Viewed'].to_numpy()
+    return pd.Series(np.resize(sample, rows), dtype=main.STRING_DTYPE)
+
+
+def run(rows, repeat):
+    raw = hours_column(rows)
+    before_t, before = best_of(lambda: legacy_clean_hours(pd.DataFrame({'Hours Viewed': raw})), repeat)
+    after_t, after = best_of(lambda: main.clean_hours(pd.DataFrame({'Hours Viewed': raw})), repeat)
+    same = np.array_equal(before['Hours Viewed'].to_numpy(), after['Hours Viewed'].to_numpy())
+    print(f"{rows:>10} rows | string round-trip {before_t:7.3f}s | arrow parser {after_t:7.3f}s"
+          f" | {before_t / after_t:5.1f}x faster | identical: {same}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark clean_hours against the old string round-trip')
+    parser.add_argument('--rows', type=int, nargs='+', default=[1_000_000, 10_000_000])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+    for rows in args.rows:
+        run(rows, args.repeat)
@@ -0,0 +1,31 @@
+import argparse
+
+import pandas as pd
+
+from common import best_of, frame_mb, scaled_csv
+
+import main
+
+
+def untyped_load(path):
+    # load_data before the declared schema: default engine, every column as object
+    return pd.read_csv(path)
+
+
+def run(rows, repeat):
+    path = scaled_csv(rows)
+    before_t, before = best_of(lambda: untyped_load(path), repeat)
+    after_t, after = best_of(lambda: main.load_data(path), repeat)
+    print(f"{rows:>10} rows | untyped {before_t:7.3f}s {frame_mb(before):8.1f} MB"
+          f" | typed {after_t:7.3f}s {frame_mb(after):8.1f} MB"
+          f" | {before_t / after_t:5.1f}x faster, {frame_mb(before) / frame_mb(after):4.1f}x smaller")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark load_data with and without the declared schema')
+    parser.add_argument('--rows', type=int, nargs='+', default=[250_000, 1_000_000])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+    print(f"pyarrow engine: {main.HAVE_PYARROW}")
+    for rows in args.rows:
+        run(rows, args.repeat)
@@ -0,0 +1,144 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from common import DATA_DIR, synthetic_csv
+
+import main
+
+DEFAULT_ROWS = [25_000, 250_000, 2_500_000, 25_000_000]
+# a stage only counts as regressed when it is also this much worse in absolute terms,
+# so millisecond-sized stages do not flag on timer noise
+MIN_TIME_DELTA_S = 0.005
+MIN_MEMORY_DELTA_MB = 1.0
+
+
+def print_top_titles_quietly(df):
+    with contextlib.redirect_stdout(io.StringIO()):
+        main.print_top_titles(df)
+
+
+def stages(path):
+    # (name, function, builder of fresh arguments) in pipeline order. builders run outside the
+    # measurement, so stages that modify their input in place each get their own copy
+    raw = main.load_data(path)
+    cleaned = main.clean_hours(raw.copy(), verbose=False)
+    dated = main.prepare_dates(cleaned.copy(), verbose=False)
+    prepared = main.prepare_holidays(dated.copy())
+    cube = main.build_cube(prepared)
+    return [
+        ('load_data', main.load_data, lambda: (path,)),
+        ('clean_hours', lambda df: main.clean_hours(df, verbose=False), lambda: (raw.copy(),)),
+        ('prepare_dates', lambda df: main.prepare_dates(df, verbose=False), lambda: (cleaned.copy(),)),
+        ('prepare_holidays', main.prepare_holidays, lambda: (dated.copy(),)),
+        ('build_cube', main.build_cube, lambda: (prepared,)),
+        ('plot_viewership_by_content_type', main.plot_viewership_by_content_type, lambda: (cube,)),
+        ('plot_viewership_by_language', main.plot_viewership_by_language, lambda: (cube,)),
+        ('plot_monthly_viewership', main.plot_monthly_viewership, lambda: (cube,)),
+        ('plot_viewership_by_type_and_month', main.plot_viewership_by_type_and_month, lambda: (cube,)),
+        ('plot_seasonal_viewership', main.plot_seasonal_viewership, lambda: (cube,)),
+        ('monthly_releases_and_viewership', main.monthly_releases_and_viewership, lambda: (cube,)),
+        ('weekday_release_patterns', main.weekday_release_patterns, lambda: (cube,)),
+        ('holiday_release_analysis', lambda df: main.holiday_release_analysis(df, save=False), lambda: (prepared,)),
+        ('print_top_titles', print_top_titles_quietly, lambda: (prepared,)),
+    ]
+
+
+def peak_memory_mb(fn, args):
+    # allocation peak of one call above what was already allocated. numpy and pandas buffers are
+    # traced; arrow buffers (pyarrow CSV reads, arrow-backed strings) come from arrow's own pool and are not
+    tracemalloc.start()
+    try:
+        base = tracemalloc.get_traced_memory()[0]
+        fn(*args)
+        return (tracemalloc.get_traced_memory()[1] - base) / 2**20
+    finally:
+        tracemalloc.stop()
+
+
+def measure(fn, make_args, repeat):
+    # best untraced wall time, then one traced call for memory (tracing slows the call down)
+    best = float('inf')
+    for _ in range(repeat):
+        args = make_args()
+        start = time.perf_counter()
+        fn(*args)
+        best = min(best, time.perf_counter() - start)
+    return {'time_s': best, 'peak_mb': peak_memory_mb(fn, make_args())}
+
+
+def run_size(rows, seed, repeat):
+    print(f"{rows} rows")
+    results = {}
+    for name, fn, make_args in stages(synthetic_csv(rows, seed)):
+        results[name] = measure(fn, make_args, repeat)
+        print(f"  {name:<34} {results[name]['time_s'] * 1e3:10.1f} ms {results[name]['peak_mb']:10.1f} MB")
+    return results
+
+
+def environment():
+    return {'python': platform.python_version(), 'numpy': np.__version__, 'pandas': pd.__version__,
+            'pyarrow': main.HAVE_PYARROW, 'cpus': os.cpu_count(), 'machine': platform.machine()}
+
+
+def regressions(results, baseline, tolerance):
+    # (rows, stage, metric, baseline, now) for every stage measured in both runs that got worse
+    # by more than `tolerance` (a fraction) and by more than the absolute floor
+    found = []
+    for rows, stages_now in results['sizes'].items():
+        for stage, now in stages_now.items():
+            before = baseline['sizes'].get(rows, {}).get(stage)
+            if before is None:
+                continue
+            for metric, floor in [('time_s', MIN_TIME_DELTA_S), ('peak_mb', MIN_MEMORY_DELTA_MB)]:
+                if now[metric] > before[metric] * (1 + tolerance) and now[metric] - before[metric] > floor:
+                    found.append((rows, stage, metric, before[metric], now[metric]))
+    return found
+
+
+def run(rows_list, seed, repeat, out_path, baseline_path, tolerance):
+    results = {'seed': seed, 'repeat': repeat, 'environment': environment(),
+               'sizes': {str(rows): run_size(rows, seed, repeat) for rows in rows_list}}
+    os.makedirs(os.path.dirname(out_path) or '.', exist_ok=True)
+    with open(out_path, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+    print(f"Saved results: {out_path}")
+
+    if not baseline_path:
+        return 0
+    with open(baseline_path, encoding='utf-8') as f:
+        baseline = json.load(f)
+    if baseline.get('environment') != results['environment']:
+        print("Warning: baseline was recorded in a different environment; comparisons may not be meaningful.")
+    found = regressions(results, baseline, tolerance)
+    for rows, stage, metric, before, now in found:
+        unit = 's' if metric == 'time_s' else ' MB'
+        print(f"REGRESSION {rows:>10} rows {stage:<34} {metric:<8} {before:.3f}{unit} -> {now:.3f}{unit}"
+              f" ({now / before:.2f}x)")
+    if found:
+        return 1
+    print(f"OK: no stage is more than {tolerance:.0%} slower or larger than {baseline_path}")
+    return 0
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Time and measure peak memory of each pipeline stage at several data '
+                                                 'sizes, and compare against a saved baseline')
+    parser.add_argument('--rows', type=int, nargs='+', default=DEFAULT_ROWS)
+    parser.add_argument('--seed', type=int, default=0, help='Seed of the synthetic input files')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--out', default=os.path.join(DATA_DIR, 'scaling.json'),
+                        help='Where to write the results (copy it somewhere to use it as a baseline)')
+    parser.add_argument('--baseline', help='Results JSON of an earlier run; exit 1 if any stage regressed against it')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='Allowed slowdown or growth, as a fraction')
+    args = parser.parse_args()
+    sys.exit(run(args.rows, args.seed, args.repeat, args.out, args.baseline, args.tolerance))
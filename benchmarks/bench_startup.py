@@ -0,0 +1,42 @@
+import argparse
+import subprocess
+import sys
+import time
+
+from common import ROOT
+
+# modules the CLI import path must not pull in: they belong to --web and to chart rendering
+LAZY_MODULES = ['streamlit', 'plotly']
+
+
+def run_python(code):
+    start = time.perf_counter()
+    out = subprocess.run([sys.executable, '-c', code], cwd=ROOT, check=True, capture_output=True, text=True).stdout
+    return time.perf_counter() - start, out
+
+
+def best_time(code, repeat):
+    return min(run_python(code)[0] for _ in range(repeat))
+
+
+def run(repeat):
+    baseline = best_time('import numpy, pandas', repeat)
+    cli = best_time('import main', repeat)
+    web = best_time('import main, streamlit, plotly.graph_objects', repeat)
+    _, out = run_python(f'import sys, main; print(" ".join(m for m in {LAZY_MODULES!r} if m in sys.modules))')
+    eager = out.split()
+    print(f"numpy + pandas          {baseline:6.3f}s")
+    print(f"import main (CLI path)  {cli:6.3f}s  (+{cli - baseline:.3f}s over numpy + pandas)")
+    print(f"with streamlit + plotly {web:6.3f}s")
+    if eager:
+        print(f"FAIL: importing main loads {', '.join(eager)}")
+        return 1
+    print(f"OK: importing main loads none of {', '.join(LAZY_MODULES)}")
+    return 0
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark main.py import time and check lazy imports stay lazy')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+    sys.exit(run(args.repeat))
@@ -0,0 +1,55 @@
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+SAMPLE_CSV = os.path.join(ROOT, 'netflix_content.csv')
+DATA_DIR = os.path.join(tempfile.gettempdir(), 'netflix_bench')
+
+
+def scaled_csv(rows):
+    # tile the sample dataset up to `rows` data rows; files are reused across runs
+    os.makedirs(DATA_DIR, exist_ok=True)
+    path = os.path.join(DATA_DIR, f'netflix_{rows}.csv')
+    if os.path.exists(path):
+        return path
+    with open(SAMPLE_CSV, encoding='utf-8') as f:
+        header = f.readline()
+        body = f.readlines()
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as out:
+        out.write(header)
+        written = 0
+        while written < rows:
+            batch = body[:rows - written]
+            out.writelines(batch)
+            written += len(batch)
+    os.replace(tmp_path, path)
+    return path
+
+
+def synthetic_csv(rows, seed=0):
+    # generated rows with the sample's schema and quirks, for sizes where tiling would only repeat 24k titles
+    from generate_data import generate_csv
+    os.makedirs(DATA_DIR, exist_ok=True)
+    path = os.path.join(DATA_DIR, f'synthetic_{rows}_{seed}.csv')
+    if not os.path.exists(path):
+        generate_csv(path, rows, seed=seed)
+    return path
+
+
+def best_of(fn, repeat=3):
+    # best wall time in seconds plus the last return value
+    best, result = float('inf'), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def frame_mb(df):
+    return df.memory_usage(deep=True).sum() / 1e6
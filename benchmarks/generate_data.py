@@ -0,0 +1,124 @@
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+# distributions measured on netflix_content.csv
+LANGUAGES = {'English': 0.696, 'Non-English': 0.1311, 'Japanese': 0.0926, 'Korean': 0.0638, 'Hindi': 0.0151,
+             'Russian': 0.0016}
+SHOW_SHARE = 0.43
+AVAILABLE_SHARE = {'Show': 0.40, 'Movie': 0.24}
+MISSING_DATE_SHARE = 0.671
+YEAR_SHARE = {2010: 0.002, 2011: 0.0007, 2012: 0.0002, 2013: 0.0026, 2014: 0.006, 2015: 0.018, 2016: 0.0411,
+              2017: 0.073, 2018: 0.1193, 2019: 0.1401, 2020: 0.1538, 2021: 0.1571, 2022: 0.1898, 2023: 0.0963}
+# hours are whole multiples of 100,000, log-normal in those units, capped near the sample's 81 crore maximum
+HOURS_UNIT = 100_000
+HOURS_LOG_MEAN, HOURS_LOG_STD = 2.48, 1.82
+HOURS_MAX_UNITS = 10_000
+# share of English titles that still carry a "// original title" part
+ENGLISH_DUAL_TITLE_SHARE = 0.11
+# rows generated and written at a time; fixed so a seed always yields the same file
+BATCH_ROWS = 250_000
+
+ENGLISH_WORDS = ['Night', 'Agent', 'Glory', 'Queen', 'Crown', 'Kingdom', 'Ocean', 'Fire', 'Shadow', 'Garden', 'Storm',
+                 'Heart', 'Secret', 'Empire', 'Dream', 'Island', 'Murder', 'Love', 'Summer', 'Winter', 'River',
+                 'Ghost', 'Hunter', 'Family', 'Wild', 'Lost', 'Silent', 'Broken', 'Golden', 'Last', 'Dark', 'Little']
+NATIVE = {
+    'Korean': (['더', '글로리', '킹더랜드', '사랑', '비밀', '왕국', '여름', '그림자', '바다'], '시즌 {n}'),
+    'Japanese': (['げんき', 'ノンタン', '夏', '秘密', '王国', '海', '影', '夢', '家族'], 'シーズン{n}'),
+    'Hindi': (['राणा', 'नायडू', 'चोर', 'मिशन', 'मजनू', 'दिल', 'रात', 'सपना'], 'सीज़न {n}'),
+    'Russian': (['Ночь', 'Тайна', 'Море', 'Зима', 'Сердце', 'Тень', 'Королева'], 'Сезон {n}'),
+    'Non-English': (['Rüzgar', 'Dime', 'cuando', 'tú', '關雲長', '下一站是幸福', 'นักเรียน', 'Corazón', 'Noche',
+                     'Sombra'], 'Temporada {n}'),
+    'English': (['Rüzgar', 'Nuit', 'Corazón', '夏', 'Сердце'], 'Season {n}'),
+}
+
+
+def indian_grouping(n):
+    # 812100000 -> "81,21,00,000": last three digits, then groups of two
+    s = str(n)
+    head, tail = s[:-3], s[-3:]
+    groups = []
+    while len(head) > 2:
+        groups.insert(0, head[-2:])
+        head = head[:-2]
+    return ','.join(([head] if head else []) + groups + [tail])
+
+
+def title_pool(rng, size):
+    # (title, language, content type) for `size` distinct-ish titles; rows draw from this pool,
+    # so titles repeat the way they do once several report periods are joined
+    languages = rng.choice(list(LANGUAGES), size=size, p=np.array(list(LANGUAGES.values())) / sum(LANGUAGES.values()))
+    shows = rng.random(size) < SHOW_SHARE
+    titles = []
+    for language, show in zip(languages, shows):
+        words = rng.choice(ENGLISH_WORDS, size=rng.integers(1, 4), replace=False)
+        title = ('The ' if rng.random() < 0.3 else '') + ' '.join(words)
+        season = int(rng.integers(1, 7))
+        if show:
+            title += f': Season {season}' if rng.random() < 0.85 else ': Limited Series'
+        if language != 'English' or rng.random() < ENGLISH_DUAL_TITLE_SHARE:
+            native_words, season_format = NATIVE[language]
+            native = ' '.join(rng.choice(native_words, size=rng.integers(1, 3), replace=False))
+            if show:
+                native += ': ' + season_format.format(n=season)
+            title += ' // ' + native
+        if rng.random() < 0.02:
+            title += ', Part ' + str(int(rng.integers(1, 4)))
+        titles.append(title)
+    return np.array(titles, dtype=object), languages, np.where(shows, 'Show', 'Movie')
+
+
+def release_dates(rng, rows):
+    years = rng.choice(list(YEAR_SHARE), size=rows, p=np.array(list(YEAR_SHARE.values())) / sum(YEAR_SHARE.values()))
+    days = (years - 1970).astype('datetime64[Y]').astype('datetime64[D]') + rng.integers(0, 365, size=rows)
+    dates = np.datetime_as_string(days, unit='D').astype(object)
+    dates[rng.random(rows) < MISSING_DATE_SHARE] = ''
+    return dates
+
+
+def hours_viewed(rng, rows):
+    units = np.clip(np.rint(rng.lognormal(HOURS_LOG_MEAN, HOURS_LOG_STD, size=rows)), 1, HOURS_MAX_UNITS).astype(np.int64)
+    values, inverse = np.unique(units, return_inverse=True)
+    formatted = np.array([indian_grouping(int(v) * HOURS_UNIT) for v in values], dtype=object)
+    return formatted[inverse]
+
+
+def batch(rng, pool, rows):
+    titles, languages, content = pool
+    pick = rng.integers(0, len(titles), size=rows)
+    content = content[pick]
+    available = rng.random(rows) < np.where(content == 'Show', AVAILABLE_SHARE['Show'], AVAILABLE_SHARE['Movie'])
+    return pd.DataFrame({
+        'Title': titles[pick],
+        'Available Globally?': np.where(available, 'Yes', 'No'),
+        'Release Date': release_dates(rng, rows),
+        'Hours Viewed': hours_viewed(rng, rows),
+        'Language Indicator': languages[pick],
+        'Content Type': content,
+    })
+
+
+def generate_csv(path, rows, seed=0, titles=100_000):
+    # written batch by batch, so the file can be far larger than memory
+    rng = np.random.default_rng(seed)
+    pool = title_pool(rng, min(titles, max(rows, 1)))
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8', newline='') as f:
+        for start in range(0, max(rows, 1), BATCH_ROWS):
+            part = batch(rng, pool, min(BATCH_ROWS, rows - start))
+            part.to_csv(f, header=start == 0, index=False)
+    os.replace(tmp_path, path)
+    return path
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Write a synthetic CSV with the schema and quirks of netflix_content.csv')
+    parser.add_argument('path', help='Output CSV path')
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--titles', type=int, default=100_000, help='Distinct titles the rows are drawn from')
+    args = parser.parse_args()
+    generate_csv(args.path, args.rows, seed=args.seed, titles=args.titles)
+    print(f"Wrote {args.rows} rows to {args.path}")
@@ -1,325 +1,1585 @@
 import argparse
+import base64
+import hashlib
+import importlib.util
+import json
 import os
 import sys
+import threading
+import time
+import tracemalloc
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from functools import lru_cache, partial, wraps
 from textwrap import dedent
 
+import numpy as np
 import pandas as pd
-import plotly.graph_objects as go
-import plotly.io as pio
-import streamlit as st
 
-# default template
-pio.templates.default = "plotly_white"
+# plotly and streamlit are imported where they are used (plotly_modules, run_dashboard), so CLI
+# runs that render nothing, or render only CSVs, don't pay for them at startup
 
 OUTPUT_DIR = "outputs"
 os.makedirs(OUTPUT_DIR, exist_ok=True)
 
+DEFAULT_IMPORTANT_DATES = ['2023-01-01','2023-02-14','2023-07-04','2023-10-31','2023-12-25']
 
-def load_data(path):
+# cleaned frames are cached here as parquet, keyed on the CSV content hash
+CACHE_DIR = ".cache"
+# bump when load_data/clean_hours/prepare_dates change what they produce
+CACHE_VERSION = 7
+
+# pyarrow is optional: it gives the fast CSV engine, arrow-backed strings and the parquet cache
+HAVE_PYARROW = importlib.util.find_spec('pyarrow') is not None
+STRING_DTYPE = 'string[pyarrow]' if HAVE_PYARROW else 'string'
+
+# --profile: @profiled functions append one record per call here while enabled
+PROFILE = {'enabled': False, 'stages': []}
+
+
+def peak_rss_mb():
+    try:
+        import resource
+    except ImportError:  # not on Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 2**20 if sys.platform == 'darwin' else peak / 2**10  # bytes on macOS, KiB elsewhere
+
+
+def profiled(fn=None, stage=None):
+    # while profiling, record wall and CPU time, rows (of the first frame argument, else of the
+    # returned frame), the tracemalloc peak above the starting level and the process RSS peak;
+    # stage: record calls under this name instead of the function's (@profiled(stage=...))
+    if fn is None:
+        return partial(profiled, stage=stage)
+
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        if not PROFILE['enabled']:
+            return fn(*args, **kwargs)
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+        wall, cpu = time.perf_counter(), time.thread_time()
+        result = fn(*args, **kwargs)
+        cpu, wall = time.thread_time() - cpu, time.perf_counter() - wall
+        frames = [a for a in args if isinstance(a, pd.DataFrame)] or [result]
+        PROFILE['stages'].append({
+            'stage': stage or fn.__name__, 'wall_s': wall, 'cpu_s': cpu,
+            'rows': len(frames[0]) if isinstance(frames[0], pd.DataFrame) else None,
+            'alloc_peak_mb': (tracemalloc.get_traced_memory()[1] - base) / 2**20,
+            'rss_peak_mb': peak_rss_mb(),
+        })
+        return result
+    return wrapper
+
+
+def csv_schema(hours_col='Hours Viewed', date_col='Release Date', lang_col='Language Indicator'):
+    # declared column types; columns not listed here are not read
+    return {
+        'Title': STRING_DTYPE,
+        'Available Globally?': 'category',
+        'Content Type': 'category',
+        lang_col: 'category',
+        hours_col: STRING_DTYPE,  # "81,21,00,000" style grouping, parsed by clean_hours
+        date_col: 'datetime',
+    }
+
+
+def read_csv_options(path, hours_col='Hours Viewed', date_col='Release Date', lang_col='Language Indicator',
+                     columns=None):
+    # columns: only read these (see selected_columns); None reads every column in the schema
+    schema = csv_schema(hours_col, date_col, lang_col)
+    header = pd.read_csv(path, nrows=0).columns.tolist()
+    if hours_col not in header:
+        # read everything so clean_hours can report the available columns
+        return {}
+    usecols = [c for c in header if c in schema and (columns is None or c in columns)]
+    return {
+        'usecols': usecols,
+        'dtype': {c: schema[c] for c in usecols if schema[c] != 'datetime'},
+        'parse_dates': [c for c in usecols if schema[c] == 'datetime'],
+    }
+
+
+@profiled
+def load_data(path, hours_col='Hours Viewed', date_col='Release Date', lang_col='Language Indicator', columns=None):
     if not os.path.exists(path):
         raise FileNotFoundError(f"CSV file not found: {path}")
-    df = pd.read_csv(path)
+    options = read_csv_options(path, hours_col, date_col, lang_col, columns=columns)
+    if HAVE_PYARROW:
+        return read_csv_arrow(path, options)
+    return pd.read_csv(path, **options)
+
+
+def read_csv_arrow(path, options):
+    # pyarrow.csv parses dates and builds dictionary columns while reading, which
+    # is much faster than read_csv(engine='pyarrow') converting them afterwards
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+
+    arrow_types = {'category': pa.dictionary(pa.int32(), pa.string()), STRING_DTYPE: pa.string()}
+    column_types = {c: arrow_types[t] for c, t in options.get('dtype', {}).items()}
+    date_types = {c: pa.timestamp('s') for c in options.get('parse_dates', [])}
+
+    def read(types):
+        convert = pa_csv.ConvertOptions(include_columns=options.get('usecols', []), column_types=types,
+                                        strings_can_be_null=True)
+        return pa_csv.read_csv(path, convert_options=convert)
+
+    try:
+        table = read({**column_types, **date_types})
+    except pa.ArrowInvalid as e:
+        # one malformed date fails the typed read; keep it as text and let prepare_dates coerce it
+        print(f"Warning: typed date parsing failed ({e}); re-reading dates as text.")
+        table = read({**column_types, **{c: pa.string() for c in date_types}})
+    df = table.to_pandas(types_mapper={pa.string(): pd.StringDtype('pyarrow')}.get)
+    # arrow dictionaries keep first-seen order; sort them like pandas does so group order is stable
+    for col in df.select_dtypes('category').columns:
+        df[col] = df[col].cat.reorder_categories(sorted(df[col].cat.categories))
     return df
 
 
-def clean_hours(df, col='Hours Viewed'):
+def file_hash(path, chunk_size=1 << 20):
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(chunk_size), b''):
+            h.update(block)
+    return h.hexdigest()
+
+
+def cache_path_for(path, cache_dir, *params, digest=None):
+    # digest: file_hash(path) when the caller already has it, so the CSV is not read an extra time
+    h = hashlib.blake2b(digest_size=16)
+    h.update((digest or file_hash(path)).encode())
+    h.update(repr((CACHE_VERSION,) + params).encode())
+    return os.path.join(cache_dir, h.hexdigest() + '.parquet')
+
+
+def load_clean_data(path, hours_col='Hours Viewed', date_col='Release Date', lang_col='Language Indicator',
+                    important_dates=None, seasons='north', cache_dir=CACHE_DIR, columns=None, digest=None):
+    # load + clean_hours + prepare_dates + prepare_holidays, reusing a cached parquet copy
+    # when the CSV is unchanged. columns limits what is read (None: everything); digest is the
+    # CSV's file_hash if already known
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"CSV file not found: {path}")
+    important_dates = list(important_dates or DEFAULT_IMPORTANT_DATES)
+    params = (hours_col, date_col, lang_col, important_dates, seasons, None if columns is None else sorted(columns))
+    cache_path = cache_path_for(path, cache_dir, *params, digest=digest) if cache_dir else None
+    if cache_path and os.path.exists(cache_path):
+        try:
+            df = read_cache(cache_path)
+            print(f"Loaded cleaned data from cache: {cache_path}")
+            # the same missing-value warnings clean_hours and prepare_dates print on an uncached run
+            missing_hours = df[hours_col].isna().sum()
+            if missing_hours:
+                print(f"Warning: {missing_hours} rows have NaN for '{hours_col}' after cleaning.")
+            missing_dates = df[date_col].isna().sum() if date_col in df.columns else 0
+            if missing_dates:
+                print(f"Warning: {missing_dates} rows have invalid or missing dates in '{date_col}'.")
+            return df
+        except Exception as e:
+            print(f"Warning: could not read cache file {cache_path}: {e}")
+
+    df = load_data(path, hours_col=hours_col, date_col=date_col, lang_col=lang_col, columns=columns)
+    df = clean_hours(df, col=hours_col)
+    if columns is None or date_col in columns:
+        df = prepare_dates(df, date_col=date_col, seasons=seasons)
+        df = prepare_holidays(df, important_dates, date_col=date_col)
+
+    if cache_path:
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp_path = cache_path + '.tmp'
+        try:
+            df.to_parquet(tmp_path, index=False)
+            os.replace(tmp_path, cache_path)
+        except Exception as e:
+            # parquet needs pyarrow or fastparquet; run uncached without them
+            print(f"Warning: could not write cache file {cache_path}: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+    return df
+
+
+@profiled
+def read_cache(cache_path):
+    return pd.read_parquet(cache_path)
+
+
+def parse_grouped_ints(values):
+    # parse "81,21,00,000"-style (or "812,100,000") strings with arrow compute kernels,
+    # going from the arrow string buffers to int64 without building Python strings.
+    # returns (int64 values, parsed mask); nulls, empty strings, anything but digits and
+    # commas, and values over 18 digits come back unparsed.
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    arr = pa.array(values, from_pandas=True)
+    digits = pc.replace_substring(arr, ',', '')
+    num_digits = pc.binary_length(digits)
+    parsed = pc.and_(pc.match_substring_regex(arr, r'^[0-9,]+$'),
+                     pc.and_(pc.greater(num_digits, 0), pc.less_equal(num_digits, 18)))
+    parsed = pc.fill_null(parsed, False)
+    values = pc.cast(pc.if_else(parsed, digits, pa.scalar(None, digits.type)), pa.int64())
+    return (pc.fill_null(values, 0).to_numpy(zero_copy_only=False),
+            parsed.to_numpy(zero_copy_only=False))
+
+
+def to_whole_hours(strings):
+    # generic parser: hours are whole numbers, so the odd decimal value is rounded
+    hours = pd.to_numeric(strings, errors='coerce')
+    hours = hours.where(hours.abs() < 2 ** 63)
+    return hours.round().astype('Int64')
+
+
+@profiled
+def clean_hours(df, col='Hours Viewed', verbose=True):
+    # hours end up as nullable Int64, so sums stay exact beyond 2**53 and missing values stay <NA>
     if col not in df.columns:
         raise KeyError(f"Column '{col}' not found in dataframe. Available cols: {df.columns.tolist()}")
-    # remove commas, strip spaces, coerce to numeric
-    df[col] = df[col].astype(str).str.replace(',', '').str.strip()
-    df[col] = pd.to_numeric(df[col], errors='coerce')
+    raw = df[col]
+    if HAVE_PYARROW and not pd.api.types.is_numeric_dtype(raw):
+        values, parsed = parse_grouped_ints(raw)
+        hours = pd.Series(pd.arrays.IntegerArray(values, ~parsed), index=df.index)
+        # spaces, decimals, signs etc. go through the generic parser, row by row
+        rest = ~parsed & raw.notna().to_numpy()
+        if rest.any():
+            stripped = raw[rest].astype(str).str.replace(',', '').str.strip()
+            hours[rest] = to_whole_hours(stripped)
+            malformed = raw[rest][hours[rest].isna() & (stripped != '')]
+            if len(malformed) and verbose:
+                examples = ', '.join(repr(v) for v in malformed.unique()[:3])
+                print(f"Warning: {len(malformed)} malformed values in '{col}' (e.g. {examples}).")
+        df[col] = hours
+    else:
+        # remove commas, strip spaces, coerce to numeric
+        df[col] = to_whole_hours(df[col].astype(str).str.replace(',', '').str.strip())
     num_missing = df[col].isna().sum()
-    if num_missing:
+    if num_missing and verbose:
         print(f"Warning: {num_missing} rows have NaN for '{col}' after cleaning.")
     return df
 
 
-def prepare_dates(df, date_col='Release Date'):
+# season of each calendar month (January first) and the chart order of the seasons
+SEASON_SCHEMES = {
+    'north': (['Winter', 'Winter', 'Spring', 'Spring', 'Spring', 'Summer',
+               'Summer', 'Summer', 'Fall', 'Fall', 'Fall', 'Winter'],
+              ['Winter', 'Spring', 'Summer', 'Fall']),
+    'south': (['Summer', 'Summer', 'Fall', 'Fall', 'Fall', 'Winter',
+               'Winter', 'Winter', 'Spring', 'Spring', 'Spring', 'Summer'],
+              ['Summer', 'Fall', 'Winter', 'Spring']),
+}
+FISCAL_START_MONTH = 4
+
+WEEKDAY_NAMES = ['Monday','Tuesday','Wednesday','Thursday','Friday','Saturday','Sunday']
+
+
+def season_table(seasons='north'):
+    # seasons: 'north', 'south', 'fiscal' (quarters of a year starting in April) or
+    # 'fiscal:<start month>'. returns the season names and a 13-entry table of codes
+    # indexed by month number, with -1 (missing) at index 0.
+    if seasons.startswith('fiscal'):
+        start = int(seasons.split(':')[1]) if ':' in seasons else FISCAL_START_MONTH
+        names = ['Q1', 'Q2', 'Q3', 'Q4']
+        codes = [((month - start) % 12) // 3 for month in range(1, 13)]
+    elif seasons in SEASON_SCHEMES:
+        by_month, names = SEASON_SCHEMES[seasons]
+        codes = [names.index(season) for season in by_month]
+    else:
+        raise ValueError(f"Unknown season definition '{seasons}'. Use north, south, fiscal or fiscal:<month>.")
+    return names, np.array([-1] + codes, dtype=np.int8)
+
+
+@profiled
+def prepare_dates(df, date_col='Release Date', verbose=True, seasons='north'):
     if date_col not in df.columns:
         raise KeyError(f"Column '{date_col}' not found in dataframe. Available cols: {df.columns.tolist()}")
     df[date_col] = pd.to_datetime(df[date_col], errors='coerce')
     missing_dates = df[date_col].isna().sum()
-    if missing_dates:
+    if missing_dates and verbose:
         print(f"Warning: {missing_dates} rows have invalid or missing dates in '{date_col}'.")
-    df['Release Month'] = df[date_col].dt.month
-    df['Release Day'] = df[date_col].dt.day_name()
-    df['Release Year'] = df[date_col].dt.year
+    # small nullable integer types: <NA> where the date is missing.
+    # Release Day is the weekday code (0 = Monday); names are only attached for display
+    df['Release Month'] = df[date_col].dt.month.astype('UInt8')
+    df['Release Day'] = df[date_col].dt.dayofweek.astype('UInt8')
+    df['Release Year'] = df[date_col].dt.year.astype('UInt16')
+    # month number (0 when missing) indexes straight into the season table
+    names, table = season_table(seasons)
+    month_codes = df['Release Month'].to_numpy(dtype=np.uint8, na_value=0)
+    df['Release Season'] = pd.Categorical.from_codes(table[month_codes], categories=names)
     return df
 
 
-def get_season(month):
-    if pd.isna(month):
-        return None
-    month = int(month)
-    if month in [12, 1, 2]:
-        return 'Winter'
-    if month in [3, 4, 5]:
-        return 'Spring'
-    if month in [6, 7, 8]:
-        return 'Summer'
-    return 'Fall'
+def with_day_names(df):
+    # tables shown or written: replace weekday codes with names
+    if 'Release Day' not in df.columns or not pd.api.types.is_integer_dtype(df['Release Day']):
+        return df
+    codes = df['Release Day'].to_numpy(dtype=np.int8, na_value=-1)
+    return df.assign(**{'Release Day': pd.Categorical.from_codes(codes, categories=WEEKDAY_NAMES)})
+
+
+@lru_cache(maxsize=None)
+@profiled
+def plotly_modules():
+    # (plotly.graph_objects, plotly.io), imported on first use; the first import sets the default template
+    import plotly.graph_objects as go
+    import plotly.io as pio
+
+    pio.templates.default = "plotly_white"
+    return go, pio
+
+
+@lru_cache(maxsize=None)
+def plotlyjs_cdn_tag():
+    # write_html(include_plotlyjs='cdn') re-reads and hashes the whole plotly.js bundle for the
+    # tag's integrity attribute on every call; build the identical tag once per process instead
+    from plotly.offline import get_plotlyjs, get_plotlyjs_version
 
+    url = f"https://cdn.plot.ly/plotly-{get_plotlyjs_version()}.min.js"
+    digest = base64.b64encode(hashlib.sha256(get_plotlyjs().encode('utf-8')).digest()).decode()
+    return url, f'<script charset="utf-8" src="{url}" integrity="sha256-{digest}" crossorigin="anonymous"></script>'
 
-def save_fig(fig, name):
+
+def figure_html(fig, offline=False):
+    # offline: load plotly.min.js from next to the file (see save_plotlyjs_bundle) instead of the CDN
+    _, pio = plotly_modules()
+    if offline:
+        return pio.to_html(fig, include_plotlyjs='directory')
+    url, tag = plotlyjs_cdn_tag()
+    html = pio.to_html(fig, include_plotlyjs=url)
+    return html.replace(f'<script charset="utf-8" src="{url}"></script>', tag, 1)
+
+
+def save_plotlyjs_bundle(manifest=None):
+    # one local copy of plotly.js shared by every chart and the report
+    from plotly.offline import get_plotlyjs, get_plotlyjs_version
+
+    if write_output('plotly.min.js', text_digest('plotly.js', get_plotlyjs_version()), get_plotlyjs, manifest):
+        print(f"Saved plotly.js bundle: {os.path.join(OUTPUT_DIR, 'plotly.min.js')}")
+
+
+def figure_spec(fig, offline=False):
+    # what a chart file is generated from: the figure JSON and how plotly.js is loaded
+    from plotly.offline import get_plotlyjs_version
+
+    return text_digest('figure', get_plotlyjs_version(), offline, fig.to_json())
+
+
+def save_fig(fig, name, offline=False, manifest=None):
+    # returns the seconds spent serializing and writing
+    start = time.perf_counter()
     path = os.path.join(OUTPUT_DIR, name + '.html')
-    fig.write_html(path, include_plotlyjs='cdn')
-    print(f"Saved interactive plot: {path}")
+    written = write_output(name + '.html', figure_spec(fig, offline), lambda: figure_html(fig, offline), manifest)
+    elapsed = time.perf_counter() - start
+    if written:
+        print(f"Saved interactive plot: {path} ({elapsed * 1000:.1f} ms)")
+    else:
+        print(f"Unchanged plot: {path}")
+    return elapsed
 
 
-def plot_viewership_by_content_type(df):
-    if 'Content Type' not in df.columns:
-        print("Skipping content type plot: 'Content Type' column missing.")
-        return
-    agg = df.groupby('Content Type')['Hours Viewed'].sum().sort_values(ascending=False)
+@profiled
+def save_figs(figures, workers=1, offline=False, manifest=None):
+    # serialize and write every figure (on a pool when workers > 1), returning once all files are written;
+    # returns the seconds each figure took
+    start = time.perf_counter()
+    if not offline:
+        plotlyjs_cdn_tag()  # once, before the workers race to build it
+    if workers <= 1:
+        # inline, so the work runs on this thread and profiled's CPU time (thread_time) sees it;
+        # --profile always renders with one worker
+        timings = {name: save_fig(fig, name, offline, manifest) for name, fig in figures.items()}
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = {name: pool.submit(save_fig, fig, name, offline, manifest) for name, fig in figures.items()}
+        timings = {name: future.result() for name, future in futures.items()}
+    if timings:
+        print(f"Rendered {len(timings)} plots in {time.perf_counter() - start:.2f}s "
+              f"({sum(timings.values()):.2f}s of per-plot work, {max(1, workers)} workers)")
+    return timings
+
+
+REPORT_PAGE = dedent('''\
+    <!DOCTYPE html>
+    <html>
+    <head>
+    <meta charset="utf-8" />
+    <title>Netflix Content Strategy Analysis</title>
+    {plotlyjs}
+    <style>body {{font-family: sans-serif; margin: 2em;}} table {{border-collapse: collapse;}}
+    th, td {{border-bottom: 1px solid #ddd; padding: 4px 8px; text-align: left;}}</style>
+    </head>
+    <body>
+    <h1>Netflix Content Strategy Analysis</h1>
+    {body}
+    </body>
+    </html>
+    ''')
+
+
+@profiled
+def save_report(figures, tables, offline=False, manifest=None):
+    # every chart and table on one page that loads plotly.js once;
+    # figures: name -> (heading, figure), tables: heading -> frame
+    def render():
+        _, pio = plotly_modules()
+        sections = []
+        for heading, fig in figures.values():
+            sections.append(f'<h2>{heading}</h2>')
+            sections.append(pio.to_html(fig, include_plotlyjs=False, full_html=False, default_height='500px'))
+        for heading, table in tables.items():
+            sections.append(f'<h2>{heading}</h2>')
+            sections.append(table.to_html(index=False, border=0))
+        plotlyjs = '<script charset="utf-8" src="plotly.min.js"></script>' if offline else plotlyjs_cdn_tag()[1]
+        return REPORT_PAGE.format(plotlyjs=plotlyjs, body='\n'.join(sections))
+
+    spec = text_digest('report', *[heading + figure_spec(fig, offline) for heading, fig in figures.values()],
+                       *[heading + table.to_csv(index=False) for heading, table in tables.items()])
+    path = os.path.join(OUTPUT_DIR, 'report.html')
+    if write_output('report.html', spec, render, manifest):
+        print(f"Saved combined report: {path}")
+    else:
+        print(f"Unchanged report: {path}")
+
+
+# --- incremental outputs: outputs/manifest.json records what each file was generated from ---
+
+MANIFEST_PATH = os.path.join(OUTPUT_DIR, 'manifest.json')
+MANIFEST_VERSION = 1
+
+# arguments that change what ends up in outputs/ (not how fast it gets there)
+MANIFEST_PARAMS = ['hours_col', 'date_col', 'language_col', 'top_n', 'top_by', 'holidays', 'holiday_window',
+                   'holiday_sweep', 'seasons', 'analyses', 'offline', 'report']
+
+
+def text_digest(*parts):
+    h = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        h.update(str(part).encode('utf-8'))
+        h.update(b'\0')
+    return h.hexdigest()
+
+
+def load_manifest():
+    try:
+        with open(MANIFEST_PATH, encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return manifest if manifest.get('version') == MANIFEST_VERSION else {}
+
+
+def save_manifest(inputs, params, outputs):
+    tmp_path = MANIFEST_PATH + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({'version': MANIFEST_VERSION, 'inputs': inputs, 'params': params, 'outputs': outputs},
+                  f, indent=2, sort_keys=True)
+    os.replace(tmp_path, MANIFEST_PATH)
+
+
+def run_fingerprint(args):
+    # (inputs, params) the outputs depend on: the data file, this script and the output arguments
+    inputs = {'data': [file_hash(path) for path in args.file], 'script': file_hash(os.path.abspath(__file__))}
+    return inputs, {name: getattr(args, name) for name in MANIFEST_PARAMS}
+
+
+def outputs_up_to_date(previous, inputs, params):
+    # same data, code and arguments as the recorded run, and every file it wrote is still intact
+    if not previous.get('outputs') or previous.get('inputs') != inputs or previous.get('params') != params:
+        return False
+    for name, entry in previous['outputs'].items():
+        path = os.path.join(OUTPUT_DIR, name)
+        if not os.path.exists(path) or file_hash(path) != entry['file']:
+            return False
+    return True
+
+
+def write_output(name, spec, render, manifest=None):
+    # write outputs/<name> from render() unless the manifest shows a file from the same spec is
+    # still there; manifest: {'previous': recorded outputs, 'current': filled in here}.
+    # returns whether the file was written
+    path = os.path.join(OUTPUT_DIR, name)
+    if manifest is not None:
+        entry = manifest['previous'].get(name)
+        if entry and entry['spec'] == spec and os.path.exists(path) and file_hash(path) == entry['file']:
+            manifest['current'][name] = entry
+            return False
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(render())
+    if manifest is not None:
+        manifest['current'][name] = {'spec': spec, 'file': file_hash(path)}
+    return True
+
+
+# --- aggregation cube: one scan of the data, every chart is a roll-up of it ---
+
+CUBE_MEASURES = ['count', 'hours']
+
+# every key here has a tiny domain (12 months, 7 weekdays, a handful of types and languages), so
+# groups are found by arithmetic on codes rather than hashing; past this many cells, use groupby
+BINCOUNT_MAX_CELLS = 1 << 22
+
+
+def key_codes(s):
+    # (codes, labels) for one key column: code 0 is a missing key and code i is labels[i - 1],
+    # with labels in the order groupby(sort=True) would use; None if the domain is too large
+    if isinstance(s.dtype, pd.CategoricalDtype):
+        codes = s.cat.codes.to_numpy().astype(np.intp) + 1
+        labels = s.cat.categories
+    elif pd.api.types.is_integer_dtype(s.dtype):
+        # small integer columns (month, weekday, year) count up from their minimum; byte-wide ones
+        # from the bottom of the type, which saves a pass over the column
+        if s.dtype.itemsize == 1:
+            lo = int(np.iinfo(getattr(s.dtype, 'numpy_dtype', s.dtype)).min)
+        else:
+            lo = s.min()
+            lo = 0 if pd.isna(lo) else int(lo)
+        # not in place: without missing values to_numpy can return a read-only view of the column
+        codes = s.to_numpy(dtype=np.intp, na_value=lo - 1) - (lo - 1)
+        hi = lo + int(codes.max(initial=0)) - 1
+        if hi - lo >= BINCOUNT_MAX_CELLS:
+            return None
+        labels = pd.array(np.arange(lo, hi + 1), dtype=s.dtype)
+    else:
+        codes, labels = pd.factorize(s, sort=True)
+        codes = codes.astype(np.intp) + 1
+    return codes, labels
+
+
+def key_labels(s, labels, codes):
+    if isinstance(s.dtype, pd.CategoricalDtype):
+        return pd.Categorical.from_codes(codes - 1, dtype=s.dtype)
+    return pd.array(labels).take(codes - 1, allow_fill=True)
+
+
+def bincount_sums(df, dims, sums, size=None, dropna=False):
+    # groupby(dims)[...].sum() for integer columns via np.bincount over one mixed-radix key per row;
+    # `sums` maps output name -> column, `size` names an optional row-count column.
+    # Cells come out sorted by key, missing keys first; returns None when groupby should be used instead
+    keys, radix = [], []
+    for dim in dims:
+        key = key_codes(df[dim])
+        if key is None:
+            return None
+        keys.append(key)
+        radix.append(len(key[1]) + 1)
+    cells = int(np.prod(radix, dtype=np.float64)) if radix else 1
+    if cells > BINCOUNT_MAX_CELLS or not all(pd.api.types.is_integer_dtype(df[col]) for col in sums.values()):
+        return None
+
+    row_key = keys[0][0] if keys else np.zeros(len(df), dtype=np.intp)
+    for (codes, _), base in zip(keys[1:], radix[1:]):
+        row_key *= base
+        row_key += codes
+    counts = np.bincount(row_key, minlength=cells)
+    observed = np.flatnonzero(counts)
+    cell_codes = np.unravel_index(observed, radix)
+    if dropna:
+        keep = np.logical_and.reduce([c > 0 for c in cell_codes])
+        observed, cell_codes = observed[keep], [c[keep] for c in cell_codes]
+
+    out = {}
+    for dim, (_, labels), codes in zip(dims, keys, cell_codes):
+        out[dim] = key_labels(df[dim], labels, codes)
+    if size is not None:
+        out[size] = pd.array(counts[observed], dtype='Int64')
+    for name, col in sums.items():
+        values = df[col].to_numpy(dtype=np.int64, na_value=0)
+        if len(values) and max(-int(values.min()), int(values.max())) * len(values) < 2**53:
+            # float64 weights are exact while every partial sum stays below 2**53
+            total = np.rint(np.bincount(row_key, weights=values, minlength=cells)).astype(np.int64)
+        else:
+            total = np.zeros(cells, dtype=np.int64)
+            np.add.at(total, row_key, values)
+        out[name] = pd.array(total[observed], dtype='Int64')
+    return pd.DataFrame(out)
+
+
+@profiled
+def build_cube(df, lang_col='Language Indicator'):
+    # release count and hours sum for every observed combination of the low-cardinality columns.
+    # Release Season is left out: it adds no cells (it follows from Release Month) but would multiply
+    # the bincount key space, so the seasonal chart sums months instead
+    dims = [c for c in ['Content Type', lang_col, 'Release Month', 'Release Day', 'Release Year',
+                        'Available Globally?'] if c in df.columns]
+    cube = bincount_sums(df, dims, {'hours': 'Hours Viewed'}, size='count')
+    if cube is None:
+        grouped = df.groupby(dims, observed=True, dropna=False, sort=False)['Hours Viewed']
+        cube = grouped.agg(count='size', hours='sum').reset_index()
+    return cube
+
+
+def merge_cubes(cubes):
+    cube = pd.concat(cubes, ignore_index=True)
+    dims = [c for c in cube.columns if c not in CUBE_MEASURES]
+    merged = bincount_sums(cube, dims, {m: m for m in CUBE_MEASURES})
+    if merged is None:
+        merged = cube.groupby(dims, observed=True, dropna=False, sort=False)[CUBE_MEASURES].sum().reset_index()
+    return merged
+
+
+def rollup(cube, dims, measure='hours'):
+    # rows with a missing key drop out, as they did with the per-chart groupbys
+    keys = [dims] if isinstance(dims, str) else list(dims)
+    agg = bincount_sums(cube, keys, {measure: measure}, dropna=True)
+    if agg is None:
+        return cube.groupby(dims, observed=True)[measure].sum()
+    return agg.set_index(dims)[measure]
+
+
+# chart figures, each built from the cube
+
+@profiled
+def plot_viewership_by_content_type(cube):
+    go, _ = plotly_modules()
+    agg = rollup(cube, 'Content Type').sort_values(ascending=False)
     fig = go.Figure(data=[go.Bar(x=agg.index, y=agg.values, marker_color=['skyblue' for _ in agg.index])])
     fig.update_layout(title='Total Viewership Hours by Content Type', xaxis_title='Content Type', yaxis_title='Total Hours Viewed')
-    save_fig(fig, 'viewership_by_content_type')
+    return fig
 
 
-def plot_viewership_by_language(df, lang_col='Language Indicator'):
-    if lang_col not in df.columns:
-        print(f"Skipping language plot: '{lang_col}' column missing.")
-        return
-    agg = df.groupby(lang_col)['Hours Viewed'].sum().sort_values(ascending=False)
+@profiled
+def plot_viewership_by_language(cube, lang_col='Language Indicator'):
+    go, _ = plotly_modules()
+    agg = rollup(cube, lang_col).sort_values(ascending=False)
     fig = go.Figure(data=[go.Bar(x=agg.index, y=agg.values)])
     fig.update_layout(title='Total Viewership Hours by Language', xaxis_title='Language', yaxis_title='Total Hours Viewed')
-    save_fig(fig, 'viewership_by_language')
+    return fig
 
 
-def plot_monthly_viewership(df):
-    if 'Release Month' not in df.columns:
-        print("Skipping monthly viewership: 'Release Month' missing.")
-        return
-    monthly = df.groupby('Release Month')['Hours Viewed'].sum().reindex(range(1,13), fill_value=0)
+@profiled
+def plot_monthly_viewership(cube):
+    go, _ = plotly_modules()
+    monthly = rollup(cube, 'Release Month').reindex(range(1,13), fill_value=0)
     fig = go.Figure(data=[go.Scatter(x=monthly.index, y=monthly.values, mode='lines+markers')])
     fig.update_layout(title='Total Viewership Hours by Release Month', xaxis_title='Month', yaxis_title='Total Hours Viewed')
-    save_fig(fig, 'monthly_viewership')
+    return fig
 
 
-def plot_viewership_by_type_and_month(df):
-    if 'Content Type' not in df.columns:
-        print("Skipping monthly by type: 'Content Type' missing.")
-        return
-    pivot = df.pivot_table(index='Release Month', columns='Content Type', values='Hours Viewed', aggfunc='sum').reindex(range(1,13)).fillna(0)
+@profiled
+def plot_viewership_by_type_and_month(cube):
+    go, _ = plotly_modules()
+    pivot = rollup(cube, ['Release Month', 'Content Type']).unstack().reindex(range(1,13)).fillna(0)
     fig = go.Figure()
     for col in pivot.columns:
         fig.add_trace(go.Scatter(x=pivot.index, y=pivot[col], mode='lines+markers', name=col))
     fig.update_layout(title='Viewership Trends by Content Type and Release Month', xaxis_title='Month', yaxis_title='Total Hours Viewed')
-    save_fig(fig, 'monthly_viewership_by_type')
+    return fig
 
 
-def plot_seasonal_viewership(df):
-    if 'Release Month' not in df.columns:
-        print("Skipping seasonal viewership: 'Release Month' missing.")
-        return
-    df['Release Season'] = df['Release Month'].apply(get_season)
-    agg = df.groupby('Release Season')['Hours Viewed'].sum()
-    seasons_order = ['Winter', 'Spring', 'Summer', 'Fall']
-    agg = agg.reindex(seasons_order).fillna(0)
+@profiled
+def plot_seasonal_viewership(cube, seasons='north'):
+    go, _ = plotly_modules()
+    # seasons are whole months, so they are summed from the month totals rather than kept in the cube
+    names, table = season_table(seasons)
+    monthly = rollup(cube, 'Release Month').reindex(range(1,13), fill_value=0)
+    agg = monthly.groupby(pd.Categorical.from_codes(table[1:], categories=names), observed=False).sum()
     fig = go.Figure(data=[go.Bar(x=agg.index, y=agg.values)])
     fig.update_layout(title='Total Viewership Hours by Release Season', xaxis_title='Season', yaxis_title='Total Hours Viewed')
-    save_fig(fig, 'seasonal_viewership')
+    return fig
 
 
-def monthly_releases_and_viewership(df):
-    monthly_releases = df['Release Month'].value_counts().sort_index().reindex(range(1,13), fill_value=0)
-    monthly_viewership = df.groupby('Release Month')['Hours Viewed'].sum().reindex(range(1,13), fill_value=0)
+@profiled
+def monthly_releases_and_viewership(cube):
+    go, _ = plotly_modules()
+    monthly_releases = rollup(cube, 'Release Month', 'count').reindex(range(1,13), fill_value=0)
+    monthly_viewership = rollup(cube, 'Release Month').reindex(range(1,13), fill_value=0)
     fig = go.Figure()
     fig.add_trace(go.Bar(x=monthly_releases.index, y=monthly_releases.values, name='Number of Releases', opacity=0.7))
     fig.add_trace(go.Scatter(x=monthly_viewership.index, y=monthly_viewership.values, name='Viewership Hours', mode='lines+markers'))
     fig.update_layout(title='Monthly Release Patterns and Viewership Hours', xaxis_title='Month')
-    save_fig(fig, 'monthly_releases_and_viewership')
+    return fig
 
 
-def weekday_release_patterns(df):
-    if 'Release Day' not in df.columns:
-        print("Skipping weekday patterns: 'Release Day' missing.")
-        return
-    order = ['Monday','Tuesday','Wednesday','Thursday','Friday','Saturday','Sunday']
-    releases = df['Release Day'].value_counts().reindex(order).fillna(0)
-    viewership = df.groupby('Release Day')['Hours Viewed'].sum().reindex(order).fillna(0)
+@profiled
+def weekday_release_patterns(cube):
+    go, _ = plotly_modules()
+    releases = rollup(cube, 'Release Day', 'count').reindex(range(7), fill_value=0)
+    viewership = rollup(cube, 'Release Day').reindex(range(7), fill_value=0)
     fig = go.Figure()
-    fig.add_trace(go.Bar(x=releases.index, y=releases.values, name='Number of Releases'))
-    fig.add_trace(go.Scatter(x=viewership.index, y=viewership.values, name='Viewership Hours', mode='lines+markers'))
+    fig.add_trace(go.Bar(x=WEEKDAY_NAMES, y=releases.values, name='Number of Releases'))
+    fig.add_trace(go.Scatter(x=WEEKDAY_NAMES, y=viewership.values, name='Viewership Hours', mode='lines+markers'))
     fig.update_layout(title='Weekly Release Patterns and Viewership Hours', xaxis_title='Day of Week')
-    save_fig(fig, 'weekday_release_patterns')
+    return fig
+
+
+def chart_specs(lang_col='Language Indicator', seasons='north'):
+    # (output name, dashboard heading, required columns, figure function of the cube)
+    return [
+        ('viewership_by_content_type', 'Viewership by Content Type', ['Content Type'],
+         plot_viewership_by_content_type),
+        ('viewership_by_language', 'Viewership by Language', [lang_col],
+         lambda cube: plot_viewership_by_language(cube, lang_col=lang_col)),
+        ('monthly_viewership', 'Monthly Viewership', ['Release Month'],
+         plot_monthly_viewership),
+        ('monthly_viewership_by_type', 'Viewership Trends by Content Type and Month', ['Content Type', 'Release Month'],
+         plot_viewership_by_type_and_month),
+        ('seasonal_viewership', 'Seasonal Viewership', ['Release Month'],
+         lambda cube: plot_seasonal_viewership(cube, seasons=seasons)),
+        ('monthly_releases_and_viewership', 'Monthly Release Patterns and Viewership', ['Release Month'],
+         monthly_releases_and_viewership),
+        ('weekday_release_patterns', 'Weekly Release Patterns and Viewership', ['Release Day'],
+         weekday_release_patterns),
+    ]
+
+
+# date-derived cube columns, read from the CSV as the date column
+DATE_PARTS = ['Release Month', 'Release Season', 'Release Day', 'Release Year']
+
+
+def analysis_columns(hours_col='Hours Viewed', date_col='Release Date', lang_col='Language Indicator'):
+    # analysis name -> CSV columns it needs; charts declare theirs in chart_specs
+    columns = {name: [hours_col] + [date_col if c in DATE_PARTS else c for c in needs]
+               for name, _, needs, _ in chart_specs(lang_col)}
+    # the holiday table writes every row's full record
+    columns['holiday_releases'] = list(csv_schema(hours_col, date_col, lang_col))
+    columns['top_titles'] = ['Title', hours_col, lang_col, 'Content Type', date_col]
+    return columns
 
 
-def holiday_release_analysis(df, important_dates=None, window_days=3):
+def selected_columns(analyses, hours_col='Hours Viewed', date_col='Release Date', lang_col='Language Indicator',
+                     sweep_days=0, top_by=()):
+    # union of the columns the selected analyses need, or None (read everything) without a selection
+    if analyses is None:
+        return None
+    by_analysis = analysis_columns(hours_col, date_col, lang_col)
+    unknown = [a for a in analyses if a not in by_analysis]
+    if unknown:
+        raise ValueError(f"Unknown analysis '{unknown[0]}'. Choose from: {', '.join(by_analysis)}")
+    columns = [c for a in analyses for c in by_analysis[a]]
+    if sweep_days:
+        columns.append(date_col)
+    if top_by:
+        columns += analysis_columns(hours_col, date_col, lang_col)['top_titles']
+        columns += [date_col if c in DATE_PARTS else c for c in top_by]
+    return list(dict.fromkeys(columns))
+
+
+def selected(analyses, name):
+    return analyses is None or name in analyses
+
+
+def charts_selected(analyses, lang_col='Language Indicator'):
+    return any(selected(analyses, name) for name, _, _, _ in chart_specs(lang_col))
+
+
+def _nearest_offset(days, targets):
+    # signed days from the nearest target (ties go to the earlier one) and that target's index
+    pos = np.searchsorted(targets, days)
+    prev = np.maximum(pos - 1, 0)
+    nxt = np.minimum(pos, len(targets) - 1)
+    idx = np.where(np.abs(days - targets[nxt]) < np.abs(days - targets[prev]), nxt, prev)
+    return days - targets[idx], idx
+
+
+def nearest_important_date(dates, important_dates):
+    # binary search on sorted day ordinals instead of comparing every row with every date.
+    # returns (signed days from the nearest important date, positive = released after it;
+    # index of that date in the sorted targets; mask of rows with a date; sorted targets)
+    targets = np.unique(pd.to_datetime(important_dates).values.astype('datetime64[D]').astype(np.int64))
+    has_date = dates.notna().to_numpy()
+    days = dates.to_numpy().astype('datetime64[D]').astype(np.int64)
+    if len(targets) == 0 or not has_date.any():
+        return np.zeros(len(days), dtype=np.int64), np.zeros(len(days), dtype=np.int64), has_date & False, targets
+    lo, hi = days[has_date].min(), days[has_date].max()
+    if hi - lo >= len(days):
+        return _nearest_offset(days, targets) + (has_date, targets)
+    # releases cover far fewer distinct days than rows: search each day in the span once,
+    # then gather (missing dates land on an arbitrary entry and are masked by has_date)
+    offset_table, idx_table = _nearest_offset(np.arange(lo, hi + 1), targets)
+    pos = np.clip(days - lo, 0, hi - lo)
+    return offset_table[pos], idx_table[pos], has_date, targets
+
+
+@profiled
+def prepare_holidays(df, important_dates=None, date_col='Release Date'):
+    # precompute the signed distance to the nearest important date, so any holiday window
+    # is a single comparison on 'Days To Holiday'
     if important_dates is None:
-        important_dates = ['2023-01-01','2023-02-14','2023-07-04','2023-10-31','2023-12-25']
-    important_dates = pd.to_datetime(important_dates)
-    if 'Release Date' not in df.columns:
-        print("Skipping holiday analysis: 'Release Date' missing.")
-        return pd.DataFrame()
-    mask = df['Release Date'].apply(lambda x: any(abs((x - d).days) <= window_days for d in important_dates) if pd.notna(x) else False)
-    holiday_releases = df[mask].copy()
+        important_dates = DEFAULT_IMPORTANT_DATES
+    offset, idx, has_date, targets = nearest_important_date(df[date_col], important_dates)
+    df['Days To Holiday'] = pd.arrays.IntegerArray(offset.astype(np.int32), ~has_date)
+    nearest = targets.astype('datetime64[D]')[idx] if len(targets) else np.zeros(len(df), dtype='datetime64[D]')
+    df['Nearest Holiday'] = pd.Series(nearest, index=df.index).astype('datetime64[s]').where(has_date)
+    return df
+
+
+def find_holiday_releases(df, important_dates=None, window_days=3, date_col='Release Date'):
+    if important_dates is None and 'Days To Holiday' in df.columns:
+        offset = df['Days To Holiday']
+    else:
+        offset = prepare_holidays(df[[date_col]].copy(), important_dates, date_col=date_col)['Days To Holiday']
+    return df[(offset.abs() <= window_days).fillna(False).to_numpy()].copy()
+
+
+def holiday_offset_histogram(df, max_window=30):
+    # releases and hours at each absolute distance 0..max_window; mergeable by addition
+    distance = df['Days To Holiday'].abs()
+    near = (distance <= max_window).fillna(False).to_numpy()
+    grouped = df['Hours Viewed'][near].groupby(distance[near].astype(np.int64))
+    hist = pd.DataFrame({'releases': grouped.size(), 'hours': grouped.sum()})
+    hist = hist.reindex(range(max_window + 1), fill_value=0)
+    hist.index.name = 'window_days'
+    return hist
+
+
+@profiled
+def holiday_window_sweep(df, max_window=30):
+    # release count and hours within +-w days of an important date, for every w in 0..max_window
+    return holiday_offset_histogram(df, max_window).cumsum()
+
+
+@profiled
+def plot_holiday_window_sweep(sweep):
+    go, _ = plotly_modules()
+    fig = go.Figure()
+    fig.add_trace(go.Bar(x=sweep.index, y=sweep['releases'], name='Number of Releases', opacity=0.7))
+    fig.add_trace(go.Scatter(x=sweep.index, y=sweep['hours'], name='Viewership Hours', mode='lines+markers', yaxis='y2'))
+    fig.update_layout(title='Releases and Viewership Hours by Holiday Window', xaxis_title='Window (days either side)',
+                      yaxis=dict(title='Number of Releases'),
+                      yaxis2=dict(title='Total Hours Viewed', overlaying='y', side='right'))
+    return fig
+
+
+@profiled
+def save_holiday_releases(holiday_releases, manifest=None):
     if holiday_releases.empty:
         print("No releases found within the specified windows around important dates.")
-        return holiday_releases
+        return
     out_path = os.path.join(OUTPUT_DIR, 'holiday_releases.csv')
-    holiday_releases.to_csv(out_path, index=False)
-    print(f"Saved holiday releases table: {out_path}")
+    text = with_day_names(holiday_releases).to_csv(index=False)
+    if write_output('holiday_releases.csv', text_digest(text), lambda: text, manifest):
+        print(f"Saved holiday releases table: {out_path}")
+    else:
+        print(f"Unchanged holiday releases table: {out_path}")
+
+
+@profiled
+def holiday_release_analysis(df, important_dates=None, window_days=3, save=True, date_col='Release Date'):
+    if date_col not in df.columns:
+        print(f"Skipping holiday analysis: '{date_col}' missing.")
+        return pd.DataFrame()
+    holiday_releases = find_holiday_releases(df, important_dates, window_days, date_col=date_col)
+    if save:
+        save_holiday_releases(holiday_releases)
     return holiday_releases
 
 
-def print_top_titles(df, n=10):
+@profiled
+def top_titles(df, n=10):
     if 'Hours Viewed' not in df.columns:
-        print("'Hours Viewed' column missing. Cannot compute top titles.")
-        return
+        return pd.DataFrame()
     top = df.nlargest(n, 'Hours Viewed')
     cols = [c for c in ['Title','Hours Viewed','Language Indicator','Content Type','Release Date'] if c in top.columns]
+    return top[cols]
+
+
+@profiled
+def merge_top_titles(tops, n=10):
+    # top_titles over everything several top_titles results were computed from (chunks, files):
+    # each part's own n best rows are all that can make the overall n, so memory stays O(n) per
+    # part however much data went in. parts are taken in order and ties keep the earlier row
+    top = pd.concat([t for t in tops if not t.empty] or tops[:1], ignore_index=True)
+    return top.nlargest(n, 'Hours Viewed') if 'Hours Viewed' in top.columns else top
+
+
+@profiled
+def print_top_titles(df, n=10):
+    print_top_table(top_titles(df, n))
+
+
+def print_top_table(top):
+    # an already computed top_titles table
+    if 'Hours Viewed' not in top.columns:
+        print("'Hours Viewed' column missing. Cannot compute top titles.")
+        return
     print('\nTop titles:')
-    print(top[cols].to_string(index=False))
+    print(top.to_string(index=False))
+
+
+# past this many groups, top_titles_by sorts once instead of selecting group by group
+TOP_BY_MAX_GROUPS = 1024
+
+
+def group_top_positions(codes, values, n):
+    # positions of the n largest values within each group code, groups in code order and each
+    # group's rows by descending value. one stable grouping pass (a radix sort for small codes),
+    # then a partial selection inside each group instead of sorting it; ties keep earlier rows
+    if len(codes) == 0 or n <= 0:
+        return np.zeros(0, dtype=np.intp)
+    if codes.max() < 1 << 16:
+        codes = codes.astype(np.uint16)
+    order = np.argsort(codes, kind='stable')
+    bounds = np.flatnonzero(np.diff(codes[order])) + 1
+    if len(bounds) >= TOP_BY_MAX_GROUPS:
+        # thousands of tiny groups (e.g. per title): one sort of everything beats a loop over them
+        order = np.lexsort((-values, codes))
+        sorted_codes = codes[order]
+        starts = np.r_[0, np.flatnonzero(sorted_codes[1:] != sorted_codes[:-1]) + 1]
+        rank = np.arange(len(order)) - np.repeat(starts, np.diff(np.r_[starts, len(order)]))
+        return order[rank < n]
+    picks = []
+    for rows in np.split(order, bounds):
+        vals = values[rows]
+        if len(rows) > n:
+            cutoff = np.partition(vals, len(vals) - n)[len(vals) - n]
+            above = vals > cutoff
+            at_cutoff = vals == cutoff
+            keep = above | (at_cutoff & (np.cumsum(at_cutoff) <= n - above.sum()))
+            rows, vals = rows[keep], vals[keep]
+        picks.append(rows[np.argsort(-vals, kind='stable')])
+    return np.concatenate(picks)
+
+
+@profiled
+def top_titles_by(df, by, n=10):
+    # top_titles within each value of `by` (rows missing it or the hours drop out), groups in
+    # key order with a 1-based Rank; an empty frame when either column is missing. weekday codes
+    # stay codes here (so groups sort Monday first and stream parts still merge); name them for display
+    if 'Hours Viewed' not in df.columns or by not in df.columns:
+        return pd.DataFrame()
+    df = df.drop(columns='Rank', errors='ignore')
+    key = key_codes(df[by])
+    codes = key[0] if key is not None else pd.factorize(df[by], sort=True)[0] + 1
+    rows = np.flatnonzero((codes > 0) & df['Hours Viewed'].notna().to_numpy())
+    values = df['Hours Viewed'].to_numpy(dtype=np.int64, na_value=0)[rows]
+    rows = rows[group_top_positions(codes[rows], values, n)]
+    cols = [by] + [c for c in ['Title','Hours Viewed','Language Indicator','Content Type','Release Date']
+                   if c in df.columns and c != by]
+    top = df.iloc[rows][cols].reset_index(drop=True)
+    group_starts = np.r_[True, codes[rows][1:] != codes[rows][:-1]]
+    position = np.arange(len(rows))
+    top.insert(1, 'Rank', position - np.maximum.accumulate(np.where(group_starts, position, 0)) + 1)
+    return top
+
+
+def print_top_titles_by(table, by):
+    if by not in table.columns:
+        print(f"\nSkipping top titles by {by}: '{by}' or 'Hours Viewed' column missing.")
+        return
+    print(f"\nTop titles by {by}:")
+    print(with_day_names(table).to_string(index=False))
+
+
+def top_by_file(by):
+    # 'Available Globally?' -> top_titles_by_available_globally.csv
+    return 'top_titles_by_' + '_'.join(''.join(c if c.isalnum() else ' ' for c in by.lower()).split()) + '.csv'
+
+
+@profiled
+def save_top_titles_by(table, by, manifest=None):
+    if table.empty:
+        return
+    out_path = os.path.join(OUTPUT_DIR, top_by_file(by))
+    text = with_day_names(table).to_csv(index=False)
+    if write_output(top_by_file(by), text_digest(text), lambda: text, manifest):
+        print(f"Saved top titles by {by}: {out_path}")
+    else:
+        print(f"Unchanged top titles by {by}: {out_path}")
+
+
+# --- analysis layer shared by the CLI and the dashboard ---
+
+def run_graph(nodes, workers=1):
+    # nodes: name -> (dependency names, function called with their results in order).
+    # each node starts once its dependencies are done, at most `workers` at a time on a thread
+    # pool (numpy/pandas kernels and file writes release the GIL); returns every result by name, in node order
+    results, pending, running = {}, dict(nodes), {}
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        while pending or running:
+            for name, (deps, fn) in list(pending.items()):
+                if all(d in results for d in deps):
+                    running[pool.submit(fn, *[results[d] for d in deps])] = name
+                    del pending[name]
+            if not running:
+                raise ValueError(f"Unresolvable dependencies for: {', '.join(pending)}")
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                results[running.pop(future)] = future.result()
+    return {name: results[name] for name in nodes}
+
+
+def chart_figure(cube, needs, plot):
+    # (figure, None), or (None, why the chart is skipped)
+    missing = [c for c in needs if c not in cube.columns]
+    if missing:
+        return None, f"'{missing[0]}' column missing."
+    return plot(cube), None
+
+
+def analysis_nodes(lang_col='Language Indicator', top_n=5, window_days=3, sweep_days=0, analyses=None, top_by=(),
+                   date_col='Release Date', seasons='north'):
+    # data -> cube -> one node per chart, plus the holiday / top-N / per-group top-N / sweep tables;
+    # the caller supplies the 'data' node (the prepared frame) or replaces the nodes that read it
+    nodes = {}
+    if charts_selected(analyses, lang_col):
+        nodes['cube'] = (['data'], lambda df: build_cube(df, lang_col=lang_col))
+    if selected(analyses, 'holiday_releases'):
+        nodes['holiday'] = (['data'], lambda df: holiday_release_analysis(df, window_days=window_days, save=False,
+                                                                        date_col=date_col))
+    if selected(analyses, 'top_titles'):
+        nodes['top'] = (['data'], lambda df: top_titles(df, top_n))
+    for by in top_by:
+        nodes['top_by:' + by] = (['data'], partial(lambda df, by: top_titles_by(df, by, top_n), by=by))
+    for name, _, needs, plot in chart_specs(lang_col, seasons):
+        if selected(analyses, name):
+            nodes['figure:' + name] = (['cube'], partial(chart_figure, needs=needs, plot=plot))
+    if sweep_days:
+        nodes['holiday_sweep'] = (['data'], lambda df: holiday_window_sweep(df, sweep_days)
+                                  if 'Days To Holiday' in df.columns else None)
+        nodes['figure:holiday_window_sweep'] = (['holiday_sweep'], lambda sweep: (
+            None if sweep is None else plot_holiday_window_sweep(sweep), None))
+    return nodes
+
+
+def output_nodes(nodes, workers=1, offline=False, report=False, manifest=None):
+    # write the tables as soon as they are ready, and every figure in one batched render;
+    # offline: charts load a local plotly.min.js, report: also write everything to report.html,
+    # manifest: skip files whose spec is unchanged (see write_output)
+    charts = [n for n in nodes if n.startswith('figure:')]
+    if charts:
+        nodes['save:figures'] = (charts, partial(save_charts, [n[7:] for n in charts], workers=workers,
+                                                 offline=offline, manifest=manifest))
+    if 'holiday' in nodes:
+        nodes['save:holiday_releases'] = (['holiday'], partial(save_holiday_releases, manifest=manifest))
+    if 'holiday_sweep' in nodes:
+        nodes['save:holiday_window_sweep_table'] = (['holiday_sweep'],
+                                                    partial(save_holiday_window_sweep, manifest=manifest))
+    for name in [n for n in nodes if n.startswith('top_by:')]:
+        nodes['save:' + name] = ([name], partial(save_top_titles_by, by=name[7:], manifest=manifest))
+    if offline:
+        nodes['save:plotlyjs'] = ([], partial(save_plotlyjs_bundle, manifest=manifest))
+    if report:
+        parts = charts + [n for n in nodes if n in ('holiday', 'top') or n.startswith('top_by:')]
+        nodes['save:report'] = (parts, partial(save_report_parts, parts, offline=offline, manifest=manifest))
+    return nodes
+
+
+def collect_results(values):
+    figures, skipped = {}, {}
+    for name, value in values.items():
+        if name.startswith('figure:'):
+            fig, reason = value
+            if fig is not None:
+                figures[name[7:]] = fig
+            elif reason:
+                skipped[name[7:]] = reason
+    top_by = {name[7:]: value for name, value in values.items() if name.startswith('top_by:')}
+    return {'cube': values.get('cube'), 'figures': figures, 'skipped': skipped, 'holiday': values.get('holiday'),
+            'top': values.get('top'), 'top_by': top_by, 'holiday_sweep': values.get('holiday_sweep')}
+
+
+def analyze(df, lang_col='Language Indicator', top_n=5, window_days=3, sweep_days=0, analyses=None, workers=1,
+            top_by=(), date_col='Release Date', seasons='north'):
+    # every aggregate, figure and table the CLI and dashboard show, computed once
+    nodes = {'data': ([], lambda: df), **analysis_nodes(lang_col, top_n, window_days, sweep_days, analyses, top_by,
+                                                          date_col, seasons)}
+    return collect_results(run_graph(nodes, workers))
+
+
+def save_charts(names, *charts, workers=1, offline=False, manifest=None):
+    figures = {name: fig for name, (fig, _) in zip(names, charts) if fig is not None}
+    return save_figs(figures, workers, offline, manifest)
+
+
+def save_report_parts(names, *parts, offline=False, manifest=None):
+    results = collect_results(dict(zip(names, parts)))
+    headings = {name: heading for name, heading, _, _ in chart_specs()}
+    headings['holiday_window_sweep'] = 'Holiday Window Sweep'
+    tables = {}
+    if results['top'] is not None and not results['top'].empty:
+        tables['Top Titles'] = results['top']
+    for by, table in results['top_by'].items():
+        if not table.empty:
+            tables[f'Top Titles by {by}'] = with_day_names(table)
+    if results['holiday'] is not None and not results['holiday'].empty:
+        tables['Holiday Releases'] = with_day_names(results['holiday'])
+    save_report({name: (headings[name], fig) for name, fig in results['figures'].items()}, tables, offline, manifest)
+
+
+@profiled
+def save_holiday_window_sweep(sweep, manifest=None):
+    if sweep is None:
+        return
+    out_path = os.path.join(OUTPUT_DIR, 'holiday_window_sweep.csv')
+    text = sweep.to_csv()
+    if write_output('holiday_window_sweep.csv', text_digest(text), lambda: text, manifest):
+        print(f"Saved holiday window sweep: {out_path}")
+    else:
+        print(f"Unchanged holiday window sweep: {out_path}")
+
+
+def report_results(results):
+    # the console summary once everything is written
+    for name, reason in results['skipped'].items():
+        print(f"Skipping {name}: {reason}")
+    if results['top'] is not None:
+        print_top_table(results['top'])
+    for by, table in results['top_by'].items():
+        print_top_titles_by(table, by)
+
+
+# --- streaming mode: fold bounded chunks into mergeable partial aggregates ---
+
+def chunk_aggregates(df, lang_col='Language Indicator', top_n=5, window_days=3, sweep_days=0, analyses=None,
+                     top_by=(), date_col='Release Date'):
+    has_dates = 'Days To Holiday' in df.columns
+    return {
+        'rows': len(df),
+        'missing_hours': int(df['Hours Viewed'].isna().sum()),
+        'missing_dates': int(df[date_col].isna().sum()) if has_dates else 0,
+        'cube': build_cube(df, lang_col=lang_col) if charts_selected(analyses, lang_col) else None,
+        'holiday': (holiday_release_analysis(df, window_days=window_days, save=False, date_col=date_col)
+                    if selected(analyses, 'holiday_releases') else None),
+        'holiday_hist': holiday_offset_histogram(df, sweep_days) if sweep_days and has_dates else None,
+        # only the chunk's own top_n rows can make the global top_n (see merge_top_titles)
+        'top': top_titles(df, top_n) if selected(analyses, 'top_titles') else None,
+        # likewise per group: the chunk's top_n of each group
+        'top_by': {by: top_titles_by(df, by, top_n) for by in top_by},
+    }
+
+
+def merge_aggregates(total, part, top_n=5):
+    if total is None:
+        return part
+    return {
+        'rows': total['rows'] + part['rows'],
+        'missing_hours': total['missing_hours'] + part['missing_hours'],
+        'missing_dates': total['missing_dates'] + part['missing_dates'],
+        'cube': None if part['cube'] is None else merge_cubes([total['cube'], part['cube']]),
+        'holiday': None if part['holiday'] is None else pd.concat([total['holiday'], part['holiday']]),
+        'holiday_hist': None if part['holiday_hist'] is None else total['holiday_hist'] + part['holiday_hist'],
+        'top': None if part['top'] is None else merge_top_titles([total['top'], part['top']], top_n),
+        'top_by': {by: top_titles_by(pd.concat([total['top_by'][by], table]), by, top_n)
+                   for by, table in part['top_by'].items()},
+    }
+
+
+@profiled(stage='load_data')
+def read_chunk(reader):
+    # the next chunk of a chunked read_csv, or None after the last; profiled as load_data,
+    # since in --stream the input is read here rather than by load_data
+    return next(reader, None)
+
+
+def stream_aggregates(paths, hours_col='Hours Viewed', date_col='Release Date', lang_col='Language Indicator',
+                      top_n=5, chunksize=250_000, important_dates=None, window_days=3, sweep_days=0,
+                      seasons='north', analyses=None, top_by=()):
+    # paths: one CSV or several with the same columns (e.g. one per report period); every chunk of
+    # every file folds into the same aggregates, in file order
+    paths = [paths] if isinstance(paths, str) else paths
+    for path in paths:
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"CSV file not found: {path}")
+    total = None
+    columns = selected_columns(analyses, hours_col, date_col, lang_col, sweep_days=sweep_days, top_by=top_by)
+    for path in paths:
+        options = read_csv_options(path, hours_col, date_col, lang_col, columns=columns)
+        with pd.read_csv(path, chunksize=chunksize, **options) as reader:
+            while True:
+                chunk = read_chunk(reader)
+                if chunk is None:
+                    break
+                chunk = clean_hours(chunk, col=hours_col, verbose=False)
+                if columns is None or date_col in columns:
+                    chunk = prepare_dates(chunk, date_col=date_col, verbose=False, seasons=seasons)
+                    chunk = prepare_holidays(chunk, important_dates, date_col=date_col)
+                part = chunk_aggregates(chunk, lang_col=lang_col, top_n=top_n, window_days=window_days,
+                                        sweep_days=sweep_days, analyses=analyses, top_by=top_by,
+                                        date_col=date_col)
+                total = merge_aggregates(total, part, top_n=top_n)
+    return total
+
+
+def main_stream(args, manifest=None):
+    try:
+        aggs = stream_aggregates(args.file, hours_col=args.hours_col, date_col=args.date_col,
+                                 lang_col=args.language_col, top_n=args.top_n, chunksize=args.chunksize,
+                                 important_dates=args.holidays, window_days=args.holiday_window,
+                                 sweep_days=args.holiday_sweep, seasons=args.seasons, analyses=args.analyses,
+                                 top_by=args.top_by)
+    except Exception as e:
+        print(f"Error loading data: {e}")
+        sys.exit(1)
+    if aggs is None:
+        print("No rows found in input.")
+        return
+
+    files = f" from {len(args.file)} files" if len(args.file) > 1 else ''
+    print(f"Streamed data: {aggs['rows']} rows{files} in chunks of {args.chunksize}")
+    if aggs['missing_hours']:
+        print(f"Warning: {aggs['missing_hours']} rows have NaN for '{args.hours_col}' after cleaning.")
+    if aggs['missing_dates']:
+        print(f"Warning: {aggs['missing_dates']} rows have invalid or missing dates in '{args.date_col}'.")
+
+    # the streamed aggregates stand in for the graph nodes that would read the full frame
+    streamed = {'cube': aggs['cube'], 'holiday': aggs['holiday'], 'top': aggs['top'],
+                'holiday_sweep': aggs['holiday_hist'].cumsum() if aggs['holiday_hist'] is not None else None,
+                **{'top_by:' + by: table for by, table in aggs['top_by'].items()}}
+    nodes = analysis_nodes(args.language_col, args.top_n, args.holiday_window, args.holiday_sweep, args.analyses,
+                           args.top_by, args.date_col, args.seasons)
+    for name in streamed.keys() & nodes.keys():
+        nodes[name] = ([], partial(lambda value: value, streamed[name]))
+    nodes = output_nodes(nodes, args.workers, offline=args.offline, report=args.report, manifest=manifest)
+    results = collect_results(run_graph(nodes, args.workers))
+    report_results(results)
+
+    print('\nAll interactive plots and tables have been saved to the "outputs" folder.')
+
+
+# --- profiling: --profile writes per-stage timings and memory peaks, --profile_stacks a sampled profile ---
+
+# a thread whose innermost frame is in one of these is waiting, not working
+IDLE_FILES = {'threading.py', 'queue.py', 'selectors.py'}
+
+
+def sample_stacks(stop, counts, interval=0.005):
+    # every interval, count the call stack (root first) of each busy thread
+    me = threading.get_ident()
+    while not stop.wait(interval):
+        for ident, frame in sys._current_frames().items():
+            if ident == me or os.path.basename(frame.f_code.co_filename) in IDLE_FILES:
+                continue
+            stack = []
+            while frame is not None:
+                stack.append(f"{frame.f_code.co_name} ({os.path.basename(frame.f_code.co_filename)})")
+                frame = frame.f_back
+            key = ';'.join(reversed(stack))
+            counts[key] = counts.get(key, 0) + 1
+
+
+def start_profile(stacks=False):
+    PROFILE.update(enabled=True, stages=[], wall=time.perf_counter(), cpu=time.process_time(), stacks={})
+    tracemalloc.start()
+    if stacks:
+        PROFILE['stop'] = threading.Event()
+        PROFILE['sampler'] = threading.Thread(target=sample_stacks, args=(PROFILE['stop'], PROFILE['stacks']),
+                                              daemon=True)
+        PROFILE['sampler'].start()
+
+
+def stage_summary(stages):
+    # one row per stage name: summed times and rows over its calls (chunks in --stream), highest peaks
+    summary = {}
+    for record in stages:
+        row = summary.setdefault(record['stage'], {'stage': record['stage'], 'calls': 0, 'wall_s': 0.0, 'cpu_s': 0.0,
+                                                   'rows': None, 'alloc_peak_mb': 0.0, 'rss_peak_mb': None})
+        row['calls'] += 1
+        row['wall_s'] += record['wall_s']
+        row['cpu_s'] += record['cpu_s']
+        if record['rows'] is not None:
+            row['rows'] = (row['rows'] or 0) + record['rows']
+        row['alloc_peak_mb'] = max(row['alloc_peak_mb'], record['alloc_peak_mb'])
+        if record['rss_peak_mb'] is not None:
+            row['rss_peak_mb'] = max(row['rss_peak_mb'] or 0, record['rss_peak_mb'])
+    return list(summary.values())
+
+
+def finish_profile(path, stacks_path=None):
+    if 'sampler' in PROFILE:
+        PROFILE['stop'].set()
+        PROFILE['sampler'].join()
+    total = {'wall_s': time.perf_counter() - PROFILE['wall'], 'cpu_s': time.process_time() - PROFILE['cpu'],
+             'alloc_peak_mb': tracemalloc.get_traced_memory()[1] / 2**20, 'rss_peak_mb': peak_rss_mb()}
+    tracemalloc.stop()
+    PROFILE['enabled'] = False
+    stages = stage_summary(PROFILE['stages'])
+
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'total': total, 'stages': stages, 'calls': PROFILE['stages']}, f, indent=2)
+    print(f"\nProfile ({total['wall_s']:.2f}s wall, {total['cpu_s']:.2f}s CPU, "
+          f"{total['alloc_peak_mb']:.1f} MB traced peak):")
+    for row in sorted(stages, key=lambda r: r['wall_s'], reverse=True):
+        rows = '' if row['rows'] is None else f"{row['rows']:>10} rows"
+        print(f"  {row['stage']:<34} {row['wall_s']:8.3f}s wall {row['cpu_s']:8.3f}s CPU "
+              f"{row['alloc_peak_mb']:8.1f} MB {rows}")
+    print(f"Saved profile: {path}")
+    if stacks_path:
+        with open(stacks_path, 'w', encoding='utf-8') as f:
+            for stack, count in sorted(PROFILE['stacks'].items()):
+                f.write(f"{stack} {count}\n")
+        print(f"Saved collapsed stacks: {stacks_path}")
+
+
+# --- dashboard filters: a bitmap per category value and a date-sorted row index, built once ---
+
+def filter_columns(lang_col='Language Indicator'):
+    return [lang_col, 'Content Type', 'Available Globally?']
+
+
+@profiled
+def build_filter_index(df, lang_col='Language Indicator', date_col='Release Date'):
+    # bitmaps: column -> {value: np.packbits of the rows holding it} (rows/8 bytes per value);
+    # dated rows: row positions sorted by release day, with those days, for range lookups
+    index = {'rows': len(df), 'bitmaps': {}, 'dated_rows': None, 'days': None}
+    for col in [c for c in filter_columns(lang_col) if c in df.columns]:
+        key = key_codes(df[col])
+        if key is None:
+            codes, labels = pd.factorize(df[col], sort=True)
+            key = codes + 1, labels
+        codes, labels = key
+        order = np.argsort(codes, kind='stable')
+        bounds = np.searchsorted(codes[order], np.arange(len(labels) + 2))
+        bitmaps = {}
+        for i, label in enumerate(labels, start=1):
+            rows = order[bounds[i]:bounds[i + 1]]
+            if len(rows):
+                mask = np.zeros(len(df), dtype=bool)
+                mask[rows] = True
+                bitmaps[label] = np.packbits(mask)
+        index['bitmaps'][col] = bitmaps
+    if date_col in df.columns and pd.api.types.is_datetime64_any_dtype(df[date_col]):
+        days = df[date_col].to_numpy().astype('datetime64[D]')
+        dated = np.flatnonzero(~np.isnat(days))
+        order = np.argsort(days[dated], kind='stable')
+        index['dated_rows'], index['days'] = dated[order], days[dated][order]
+    return index
+
+
+def filter_rows(index, selections, date_range=None):
+    # row positions passing every filter, or None when nothing is filtered. selections: column ->
+    # chosen values (OR within a column, AND across columns; an empty choice does not filter);
+    # date_range: inclusive (first, last) release days, which also drops rows without a date
+    bits = None
+    for col, values in selections.items():
+        if not values or col not in index['bitmaps']:
+            continue
+        empty = np.zeros((index['rows'] + 7) // 8, dtype=np.uint8)
+        chosen = np.bitwise_or.reduce([index['bitmaps'][col].get(v, empty) for v in values])
+        bits = chosen if bits is None else bits & chosen
+    if date_range is not None and index['days'] is not None:
+        first, last = np.datetime64(date_range[0], 'D'), np.datetime64(date_range[1], 'D')
+        lo, hi = np.searchsorted(index['days'], first), np.searchsorted(index['days'], last, side='right')
+        mask = np.zeros(index['rows'], dtype=bool)
+        mask[index['dated_rows'][lo:hi]] = True
+        bits = np.packbits(mask) if bits is None else bits & np.packbits(mask)
+    if bits is None:
+        return None
+    return np.flatnonzero(np.unpackbits(bits, count=index['rows']))
 
 
 def run_dashboard(args):
+    import streamlit as st
+
     st.title("Netflix Content Strategy Analysis Dashboard")
 
+    # streamlit reruns this function on every interaction; cache each stage, bounded by
+    # entry count and age so several open datasets don't grow memory without limit
+    cache_dir = None if args.no_cache else args.cache_dir
+    limits = {'max_entries': args.dashboard_cache_entries, 'ttl': args.dashboard_cache_ttl}
+
+    @st.cache_data(show_spinner=False, **limits)
+    def cached_file_hash(path, size, mtime_ns):
+        return file_hash(path)
+
+    @st.cache_resource(show_spinner="Loading data...", **limits)
+    def cached_frame(path, digest, hours_col, date_col, lang_col, important_dates, seasons, analyses):
+        # one shared frame per dataset; analyze() only reads it
+        columns = selected_columns(analyses, hours_col, date_col, lang_col)
+        return load_clean_data(path, hours_col=hours_col, date_col=date_col, lang_col=lang_col,
+                               important_dates=important_dates, seasons=seasons, cache_dir=cache_dir,
+                               columns=columns, digest=digest)
+
+    @st.cache_resource(show_spinner="Indexing filters...", **limits)
+    def cached_filter_index(path, digest, hours_col, date_col, lang_col, important_dates, seasons, analyses):
+        df = cached_frame(path, digest, hours_col, date_col, lang_col, important_dates, seasons, analyses)
+        return build_filter_index(df, lang_col=lang_col, date_col=date_col)
+
+    def filtered_frame(path, digest, hours_col, date_col, lang_col, important_dates, seasons, analyses, filters):
+        # filters: (((column, chosen values), ...), date range or None); combining them is bitwise
+        # ANDs over the cached index, then one take of the matching rows
+        df = cached_frame(path, digest, hours_col, date_col, lang_col, important_dates, seasons, analyses)
+        index = cached_filter_index(path, digest, hours_col, date_col, lang_col, important_dates, seasons, analyses)
+        selections, date_range = filters
+        rows = filter_rows(index, dict(selections), date_range)
+        return df if rows is None else df.take(rows)
+
+    @st.cache_data(show_spinner="Computing charts...", **limits)
+    def cached_results(path, digest, hours_col, date_col, lang_col, important_dates, seasons, analyses,
+                       window_days, top_n, filters):
+        df = filtered_frame(path, digest, hours_col, date_col, lang_col, important_dates, seasons, analyses, filters)
+        results = analyze(df, lang_col=lang_col, top_n=top_n, window_days=window_days, analyses=analyses,
+                          workers=args.workers, date_col=date_col, seasons=seasons)
+        # figure dicts pickle faster than Figure objects and st.plotly_chart takes them as-is
+        results['figures'] = {name: fig.to_dict() for name, fig in results['figures'].items()}
+        results['shape'] = df.shape
+        results['columns'] = df.columns.tolist()
+        return results
+
+    @st.cache_data(show_spinner=False, **limits)
+    def cached_top_by(path, digest, hours_col, date_col, lang_col, important_dates, seasons, analyses, filters,
+                      by, top_n):
+        df = filtered_frame(path, digest, hours_col, date_col, lang_col, important_dates, seasons, analyses, filters)
+        return top_titles_by(df, by, top_n)
+
     try:
-        df = load_data(args.file)
+        path = args.file[0]
+        stat = os.stat(path)
+        digest = cached_file_hash(path, stat.st_size, stat.st_mtime_ns)
+        analyses = None if args.analyses is None else tuple(args.analyses)
+        dataset = (path, digest, args.hours_col, args.date_col, args.language_col, tuple(args.holidays), args.seasons,
+                   analyses)
+        index = cached_filter_index(*dataset)
     except Exception as e:
         st.error(f"Error loading data: {e}")
         return
 
-    st.write(f"Loaded data: {len(df)} rows, {len(df.columns)} columns")
+    # filters: an empty choice keeps every value; narrowing the date range drops undated rows
+    st.sidebar.header("Filters")
+    selections = tuple((col, tuple(st.sidebar.multiselect(col, list(values))))
+                       for col, values in index['bitmaps'].items())
+    date_range = None
+    if index['days'] is not None and len(index['days']):
+        first, last = index['days'][0].astype(object), index['days'][-1].astype(object)
+        picked = st.sidebar.date_input("Release date range", (first, last), min_value=first, max_value=last)
+        if len(picked) == 2 and tuple(picked) != (first, last):
+            date_range = (picked[0].isoformat(), picked[1].isoformat())
+    filters = (selections, date_range)
+
+    try:
+        results = cached_results(*dataset, args.holiday_window, args.top_n, filters)
+    except Exception as e:
+        st.error(f"Error computing charts: {e}")
+        return
 
-    # clean
-    df = clean_hours(df, col=args.hours_col)
-    df = prepare_dates(df, date_col=args.date_col)
+    rows, cols = results['shape']
+    if rows == index['rows']:
+        st.write(f"Loaded data: {rows} rows, {cols} columns")
+    else:
+        st.write(f"Showing {rows} of {index['rows']} rows, {cols} columns")
 
     # quick summary
     st.subheader("Data Summary")
-    st.write("Columns available:", df.columns.tolist())
-
-    # plots and outputs
-    st.subheader("Viewership by Content Type")
-    if 'Content Type' in df.columns:
-        agg = df.groupby('Content Type')['Hours Viewed'].sum().sort_values(ascending=False)
-        fig = go.Figure(data=[go.Bar(x=agg.index, y=agg.values, marker_color=['skyblue' for _ in agg.index])])
-        fig.update_layout(title='Total Viewership Hours by Content Type', xaxis_title='Content Type', yaxis_title='Total Hours Viewed')
-        st.plotly_chart(fig)
-    else:
-        st.write("Content Type column missing.")
-
-    st.subheader("Viewership by Language")
-    if args.language_col in df.columns:
-        agg = df.groupby(args.language_col)['Hours Viewed'].sum().sort_values(ascending=False)
-        fig = go.Figure(data=[go.Bar(x=agg.index, y=agg.values)])
-        fig.update_layout(title='Total Viewership Hours by Language', xaxis_title='Language', yaxis_title='Total Hours Viewed')
-        st.plotly_chart(fig)
-    else:
-        st.write(f"{args.language_col} column missing.")
-
-    st.subheader("Monthly Viewership")
-    if 'Release Month' in df.columns:
-        monthly = df.groupby('Release Month')['Hours Viewed'].sum().reindex(range(1,13), fill_value=0)
-        fig = go.Figure(data=[go.Scatter(x=monthly.index, y=monthly.values, mode='lines+markers')])
-        fig.update_layout(title='Total Viewership Hours by Release Month', xaxis_title='Month', yaxis_title='Total Hours Viewed')
-        st.plotly_chart(fig)
-    else:
-        st.write("Release Month column missing.")
-
-    st.subheader("Viewership Trends by Content Type and Month")
-    if 'Content Type' in df.columns:
-        pivot = df.pivot_table(index='Release Month', columns='Content Type', values='Hours Viewed', aggfunc='sum').reindex(range(1,13)).fillna(0)
-        fig = go.Figure()
-        for col in pivot.columns:
-            fig.add_trace(go.Scatter(x=pivot.index, y=pivot[col], mode='lines+markers', name=col))
-        fig.update_layout(title='Viewership Trends by Content Type and Release Month', xaxis_title='Month', yaxis_title='Total Hours Viewed')
-        st.plotly_chart(fig)
-    else:
-        st.write("Content Type column missing.")
-
-    st.subheader("Seasonal Viewership")
-    if 'Release Month' in df.columns:
-        df['Release Season'] = df['Release Month'].apply(get_season)
-        agg = df.groupby('Release Season')['Hours Viewed'].sum()
-        seasons_order = ['Winter', 'Spring', 'Summer', 'Fall']
-        agg = agg.reindex(seasons_order).fillna(0)
-        fig = go.Figure(data=[go.Bar(x=agg.index, y=agg.values)])
-        fig.update_layout(title='Total Viewership Hours by Release Season', xaxis_title='Season', yaxis_title='Total Hours Viewed')
-        st.plotly_chart(fig)
-    else:
-        st.write("Release Month column missing.")
+    st.write("Columns available:", results['columns'])
 
-    st.subheader("Monthly Release Patterns and Viewership")
-    monthly_releases = df['Release Month'].value_counts().sort_index().reindex(range(1,13), fill_value=0)
-    monthly_viewership = df.groupby('Release Month')['Hours Viewed'].sum().reindex(range(1,13), fill_value=0)
-    fig = go.Figure()
-    fig.add_trace(go.Bar(x=monthly_releases.index, y=monthly_releases.values, name='Number of Releases', opacity=0.7))
-    fig.add_trace(go.Scatter(x=monthly_viewership.index, y=monthly_viewership.values, name='Viewership Hours', mode='lines+markers'))
-    fig.update_layout(title='Monthly Release Patterns and Viewership Hours', xaxis_title='Month')
-    st.plotly_chart(fig)
-
-    st.subheader("Weekly Release Patterns and Viewership")
-    if 'Release Day' in df.columns:
-        order = ['Monday','Tuesday','Wednesday','Thursday','Friday','Saturday','Sunday']
-        releases = df['Release Day'].value_counts().reindex(order).fillna(0)
-        viewership = df.groupby('Release Day')['Hours Viewed'].sum().reindex(order).fillna(0)
-        fig = go.Figure()
-        fig.add_trace(go.Bar(x=releases.index, y=releases.values, name='Number of Releases'))
-        fig.add_trace(go.Scatter(x=viewership.index, y=viewership.values, name='Viewership Hours', mode='lines+markers'))
-        fig.update_layout(title='Weekly Release Patterns and Viewership Hours', xaxis_title='Day of Week')
-        st.plotly_chart(fig)
-    else:
-        st.write("Release Day column missing.")
+    # plots and outputs, from the same analysis layer the CLI uses
+    for name, heading, _, _ in chart_specs(args.language_col):
+        if not selected(args.analyses, name):
+            continue
+        st.subheader(heading)
+        if name in results['figures']:
+            st.plotly_chart(results['figures'][name])
+        else:
+            st.write(results['skipped'][name])
 
-    st.subheader("Top Titles")
-    if 'Hours Viewed' in df.columns:
-        top = df.nlargest(args.top_n, 'Hours Viewed')
-        cols = [c for c in ['Title','Hours Viewed','Language Indicator','Content Type','Release Date'] if c in top.columns]
-        st.dataframe(top[cols])
-    else:
-        st.write("'Hours Viewed' column missing.")
+    if results['top'] is not None:
+        st.subheader("Top Titles")
+        groups = [c for c in dict.fromkeys([args.language_col, 'Content Type', 'Release Month', 'Available Globally?',
+                                            *args.top_by]) if c in results['columns']]
+        by = st.selectbox("Top titles within each", ['All titles'] + groups)
+        if by != 'All titles':
+            st.dataframe(with_day_names(cached_top_by(*dataset, filters, by, args.top_n)), hide_index=True)
+        elif not results['top'].empty:
+            st.dataframe(results['top'])
+        else:
+            st.write("'Hours Viewed' column missing.")
 
-    holiday_releases = holiday_release_analysis(df)
-    if not holiday_releases.empty:
+    if results['holiday'] is not None and not results['holiday'].empty:
         st.subheader("Holiday Releases")
-        st.dataframe(holiday_releases)
+        st.dataframe(with_day_names(results['holiday']))
 
 
 def main(args):
-    try:
-        df = load_data(args.file)
-    except Exception as e:
-        print(f"Error loading data: {e}")
-        sys.exit(1)
+    # outputs/manifest.json records what the last run was built from; with the same data, code and
+    # arguments and intact files there is nothing to do, otherwise unchanged files are not rewritten
+    fingerprint = run_fingerprint(args) if all(os.path.exists(path) for path in args.file) else None
+    previous = load_manifest()
+    profile = args.profile or args.profile_stacks
+    if fingerprint and not args.force and not profile and outputs_up_to_date(previous, *fingerprint):
+        print('Outputs are up to date with the input data and arguments; nothing to rebuild (--force to rebuild).')
+        return
+    manifest = {'previous': {} if args.force else previous.get('outputs', {}), 'current': {}}
 
-    print(f"Loaded data: {len(df)} rows, {len(df.columns)} columns")
+    if profile:
+        # tracemalloc peaks are process-wide, so stages run one at a time to be measured apart
+        args.workers = 1
+        start_profile(stacks=bool(args.profile_stacks))
+        if args.holiday_sweep or charts_selected(args.analyses, args.language_col):
+            # the lazy plotly import would otherwise be charged to whichever chart is drawn first
+            plotly_modules()
+    if args.stream:
+        main_stream(args, manifest)
+    else:
+        # the manifest fingerprint already hashed the CSV; the parquet cache key reuses that hash
+        main_in_memory(args, manifest, digest=fingerprint[0]['data'][0] if fingerprint else None)
+    if fingerprint and manifest['current']:
+        save_manifest(*fingerprint, manifest['current'])
+    if profile:
+        finish_profile(args.profile or os.path.join(OUTPUT_DIR, 'profile.json'), args.profile_stacks)
 
-    # clean
-    df = clean_hours(df, col=args.hours_col)
-    df = prepare_dates(df, date_col=args.date_col)
 
-    # quick summary
-    print('\nColumns available:', df.columns.tolist())
+def main_in_memory(args, manifest=None, digest=None):
+    def load():
+        try:
+            columns = selected_columns(args.analyses, args.hours_col, args.date_col, args.language_col,
+                                       sweep_days=args.holiday_sweep, top_by=args.top_by)
+            df = load_clean_data(args.file[0], hours_col=args.hours_col, date_col=args.date_col,
+                                 lang_col=args.language_col, important_dates=args.holidays, seasons=args.seasons,
+                                 cache_dir=None if args.no_cache else args.cache_dir, columns=columns,
+                                 digest=digest)
+        except Exception as e:
+            print(f"Error loading data: {e}")
+            sys.exit(1)
 
-    # plots and outputs
-    plot_viewership_by_content_type(df)
-    plot_viewership_by_language(df, lang_col=args.language_col)
-    plot_monthly_viewership(df)
-    plot_viewership_by_type_and_month(df)
-    plot_seasonal_viewership(df)
-    monthly_releases_and_viewership(df)
-    weekday_release_patterns(df)
+        print(f"Loaded data: {len(df)} rows, {len(df.columns)} columns")
 
-    holiday_releases = holiday_release_analysis(df)
+        # quick summary
+        print('\nColumns available:', df.columns.tolist())
+        return df
 
-    print_top_titles(df, n=args.top_n)
+    # plots and outputs: load -> cube -> charts / tables -> files, independent nodes in parallel
+    nodes = {'data': ([], load),
+             **analysis_nodes(args.language_col, args.top_n, args.holiday_window, args.holiday_sweep, args.analyses,
+                              args.top_by, args.date_col, args.seasons)}
+    nodes = output_nodes(nodes, args.workers, offline=args.offline, report=args.report, manifest=manifest)
+    results = collect_results(run_graph(nodes, args.workers))
+    report_results(results)
 
     print('\nAll interactive plots and tables have been saved to the "outputs" folder.')
 
 
 if __name__ == '__main__':
     parser = argparse.ArgumentParser(description='Netflix Content Strategy Analysis')
-    parser.add_argument('--file', type=str, default='netflix_content.csv', help='Path to the CSV file')
+    parser.add_argument('--file', type=str, nargs='+', default=['netflix_content.csv'],
+                        help='Path to the CSV file; with --stream, several files with the same columns')
     parser.add_argument('--hours_col', type=str, default='Hours Viewed', help='Name of the Hours Viewed column')
     parser.add_argument('--date_col', type=str, default='Release Date', help='Name of the Release Date column')
     parser.add_argument('--language_col', type=str, default='Language Indicator', help='Name of the language column')
     parser.add_argument('--top_n', type=int, default=5, help='How many top titles to print')
+    parser.add_argument('--top_by', type=str, nargs='+', default=[], metavar='COL',
+                        help="Also list the top titles within each value of these columns, e.g. 'Language Indicator' "
+                             "'Content Type' 'Release Month' 'Available Globally?'")
+    parser.add_argument('--holidays', type=str, nargs='+', default=DEFAULT_IMPORTANT_DATES,
+                        help='Important dates (YYYY-MM-DD) for the holiday release analysis')
+    parser.add_argument('--holiday_window', type=int, default=3, help='Days either side of an important date')
+    parser.add_argument('--holiday_sweep', type=int, default=0,
+                        help='Also report releases and hours for every window from 0 to this many days')
+    parser.add_argument('--seasons', type=str, default='north',
+                        help="Season definition: north, south, fiscal (quarters from April) or fiscal:<start month>")
+    parser.add_argument('--analyses', type=str, nargs='+', default=None, choices=list(analysis_columns()),
+                        metavar='NAME', help='Only run these analyses (and read only the columns they need): '
+                                             + ', '.join(analysis_columns()))
+    parser.add_argument('--workers', type=int, default=min(4, os.cpu_count() or 1),
+                        help='Threads for building and writing charts and tables in parallel')
+    parser.add_argument('--offline', action='store_true',
+                        help='Reference a local outputs/plotly.min.js from every chart instead of the CDN')
+    parser.add_argument('--report', action='store_true',
+                        help='Also write outputs/report.html with every chart and table on one page')
+    parser.add_argument('--force', action='store_true', help='Rewrite every output even if the manifest says it is current')
+    parser.add_argument('--profile', type=str, nargs='?', const=os.path.join(OUTPUT_DIR, 'profile.json'), default=None,
+                        metavar='PATH', help='Write wall/CPU time, rows and memory peaks per stage as JSON '
+                                             '(default outputs/profile.json); runs stages one at a time')
+    parser.add_argument('--profile_stacks', type=str, default=None, metavar='PATH',
+                        help='With profiling, also write sampled call stacks in collapsed format for flamegraph tools')
+    parser.add_argument('--cache_dir', type=str, default=CACHE_DIR, help='Directory for the cleaned-data parquet cache')
+    parser.add_argument('--no_cache', action='store_true', help='Always re-parse the CSV instead of using the cache')
+    parser.add_argument('--stream', action='store_true', help='Read the CSV in chunks and aggregate in constant memory')
+    parser.add_argument('--chunksize', type=int, default=250_000, help='Rows per chunk in --stream mode')
+    parser.add_argument('--dashboard_cache_entries', type=int, default=4, help='Datasets the dashboard keeps cached')
+    parser.add_argument('--dashboard_cache_ttl', type=int, default=3600, help='Seconds before a cached dashboard dataset expires')
     parser.add_argument('--web', action='store_true', help='Run the web dashboard instead of CLI analysis')
     args = parser.parse_args()
+    if len(args.file) > 1 and (args.web or not args.stream):
+        parser.error('several --file paths are only supported with --stream')
     if args.web:
         run_dashboard(args)
     else: